@@ -0,0 +1,257 @@
+# api_server.py
+#Headless HTTP API over the same fetcher, transforms and cache layer as the dashboard, so other
+#tools share one cached data plane instead of scraping the UI or calling EDGAR themselves.
+#
+#   python api_server.py --port 8600
+#   curl 'localhost:8600/companies?q=intel'
+#   curl 'localhost:8600/companies/0000050863/table?format=csv'
+#   curl 'localhost:8600/companies/0000050863/changes?format=arrow' -o changes.arrow
+#   curl 'localhost:8600/companies/0000050863/table?format=parquet' -o table.parquet
+#   curl 'localhost:8600/companies/0000050863/summary?quarter=CY2024Q1&format=txt'
+import argparse
+import gzip
+import hashlib
+import json
+import re
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional
+from urllib.parse import urlsplit, parse_qs
+import pandas as pd
+from config import API_PORT, API_BUDGET_S, API_MAX_AGE_S, CACHE_ADMIN, CACHE_MAX_BYTES, CACHE_POLICY
+from services.sec_api import SECDataFetcher, PageLoad, cik_tag
+from services.transforms import build_financial_table, compute_changes, compute_change_matrix
+from services.columnar import ARROW_MIME, PARQUET_MIME, arrow_available, to_arrow_ipc, to_parquet
+from services.formatting import format_for_display, to_csv_block, to_plaintext_combined
+from utils.sized_cache import SizeAwareCache
+
+TABLE_FORMATS = ("json", "csv", "arrow", "parquet")
+GZIP_MIN_BYTES = 1024
+
+class ApiError(Exception):
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+class Response:
+    __slots__ = ("body", "content_type", "etag", "filename", "cacheable", "degraded", "stale_since", "missing")
+
+    def __init__(self, body: bytes, content_type: str, filename: Optional[str] = None, cacheable: bool = True):
+        self.body = body
+        self.cacheable = cacheable
+        self.content_type = content_type
+        self.etag = 'W/"' + hashlib.sha1(body).hexdigest()[:20] + '"'
+        self.filename = filename
+        # Set when the latency budget ran out: stale copies were served and/or requests are missing
+        self.degraded = False
+        self.stale_since: Optional[float] = None
+        self.missing = 0
+
+class FinancialApi:
+    def __init__(self, fetcher: SECDataFetcher):
+        self.fetcher = fetcher
+        self.cache = fetcher.cache
+        self._names: Optional[Dict[str, str]] = None
+
+    # ----------------- data -----------------
+
+    def company_name(self, cik: str) -> str:
+        if self._names is None:
+            self._names = {c["cik"]: c["name"] for c in self.fetcher.get_company_list()}
+        name = self._names.get(cik.zfill(10))
+        if name is None:
+            raise ApiError(404, f"Unknown CIK {cik}.")
+        return name
+
+    def table(self, cik: str, page: PageLoad) -> pd.DataFrame:
+        # Same key as the dashboard's cached load(cik, revenue_tag, company_name)
+        name = self.company_name(cik)
+        revenue_tag = self.fetcher.best_revenue_tag(name, cik)
+        if revenue_tag is None:
+            raise ApiError(504, f"EDGAR did not answer in time to pick a revenue tag for {name}.")
+        key = ("table", cik, revenue_tag, name)
+        df = self.cache.get_or_compute(key, lambda: build_financial_table(cik, revenue_tag, self.fetcher),
+                                       ttl=3600, tags=[cik_tag(cik)])
+        if page.degraded:
+            self.cache.invalidate(key)
+        if df.empty:
+            raise ApiError(404, f"No financial data available for {name}.")
+        return df
+
+    # ----------------- routes -----------------
+
+    def route(self, path: str, query: Dict[str, str], page: PageLoad) -> Response:
+        fmt = query.get("format", "json").lower()
+        if path in ("/", "/health"):
+            return _json({"status": "ok", "cache": self.cache.stats(), "hedged_requests": self.fetcher.hedges},
+                         cacheable=False)
+        if path == "/companies":
+            return self.companies(query.get("q", ""), _int_param(query, "limit", 50), fmt)
+        m = re.match(r"^/companies/(\d{1,10})/(table|changes|summary)$", path)
+        if not m:
+            raise ApiError(404, f"No route for {path}.")
+        cik, what = m[1].zfill(10), m[2]
+        df = self.table(cik, page)
+        name = self.company_name(cik)
+        if what == "table":
+            return _frame(df.drop(columns=["frame"], errors="ignore"), fmt, f"{cik}_table")
+        if what == "changes":
+            return _frame(compute_change_matrix(df), fmt, f"{cik}_changes")
+        return self.summary(df, name, cik, query.get("quarter") or df["Quarter"].iloc[0], fmt)
+
+    def companies(self, q: str, limit: int, fmt: str) -> Response:
+        q = q.strip().lower()
+        rows = [c for c in self.fetcher.get_company_list()
+                if not q or q in c["name"].lower() or q == c["ticker"].lower()]
+        return _frame(pd.DataFrame(rows[:max(1, min(limit, 500))], columns=["name", "ticker", "cik"]), fmt, "companies")
+
+    def summary(self, df: pd.DataFrame, name: str, cik: str, quarter: str, fmt: str) -> Response:
+        try:
+            current, qoq, yoy = compute_changes(df.copy(), quarter)
+        except ValueError as e:
+            raise ApiError(404, str(e))
+        title = f"{name} — Financial Summary ({quarter})"
+        if fmt in ("csv", "txt"):
+            formatted = format_for_display(current, qoq, yoy)
+            formatted.index.name = "Metric"
+            formatted = formatted.reset_index()
+            if fmt == "txt":
+                body = to_plaintext_combined(formatted, None, title)
+                return Response(body.encode("utf-8"), "text/plain; charset=utf-8", f"{cik}_{quarter}_summary.txt")
+            return Response(to_csv_block(formatted).encode("utf-8"), "text/csv; charset=utf-8", f"{cik}_{quarter}_summary.csv")
+        typed = pd.DataFrame({"Current": current, "QoQ Change": qoq, "YoY Change": yoy})
+        typed = typed.apply(pd.to_numeric, errors="coerce")  # "N/A" → NaN
+        typed.index.name = "Metric"
+        return _frame(typed.reset_index(), fmt, f"{cik}_{quarter}_summary")
+
+    def handle(self, path: str, query: Dict[str, str]) -> Response:
+        """Serve from the response cache, else build within the latency budget (degraded results aren't cached)."""
+        m = re.match(r"^/companies/(\d{1,10})/", path)
+        tags = [cik_tag(m[1].zfill(10))] if m else []
+        key = ("response", path, tuple(sorted(query.items())))
+        hit = self.cache.get(key)
+        if hit is not None:
+            return hit
+        with self.fetcher.page_budget(API_BUDGET_S) as page:
+            resp = self.route(path, query, page)
+        if page.degraded:
+            resp.degraded, resp.stale_since, resp.missing = True, page.oldest, page.missing
+        elif path not in ("/", "/health"):
+            self.cache.set(key, resp, ttl=API_MAX_AGE_S, tags=tags, nbytes=len(resp.body))
+        return resp
+
+def _int_param(query: Dict[str, str], name: str, default: int) -> int:
+    try:
+        return int(query.get(name, default))
+    except ValueError:
+        raise ApiError(400, f"{name} must be an integer.")
+
+def _json(obj, cacheable: bool = True) -> Response:
+    return Response(json.dumps(obj, default=str).encode("utf-8"), "application/json", cacheable=cacheable)
+
+def _frame(df: pd.DataFrame, fmt: str, stem: str) -> Response:
+    if fmt not in TABLE_FORMATS:
+        raise ApiError(400, f"format must be one of {', '.join(TABLE_FORMATS)}.")
+    if fmt == "csv":
+        return Response(df.to_csv(index=False).encode("utf-8"), "text/csv; charset=utf-8", f"{stem}.csv")
+    if fmt in ("arrow", "parquet"):
+        if not arrow_available():
+            raise ApiError(406, "Arrow/Parquet output needs pyarrow installed on the server.")
+        if fmt == "parquet":
+            return Response(to_parquet(df), PARQUET_MIME, f"{stem}.parquet")
+        return Response(to_arrow_ipc(df), ARROW_MIME, f"{stem}.arrow")
+    return Response(df.to_json(orient="records", date_format="iso").encode("utf-8"), "application/json")
+
+def make_handler(api: FinancialApi):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self):
+            url = urlsplit(self.path)
+            query = {k: v[-1] for k, v in parse_qs(url.query).items()}
+            try:
+                resp = api.handle(url.path.rstrip("/") or "/", query)
+            except ApiError as e:
+                self._send(e.status, _json({"error": str(e)}))
+                return
+            except Exception as e:  # EDGAR down with nothing cached, bad input, ...
+                self._send(502, _json({"error": f"{type(e).__name__}: {e}"}))
+                return
+            if resp.etag in [t.strip() for t in self.headers.get("If-None-Match", "").split(",")]:
+                self._send(304, resp, body=False)
+                return
+            self._send(200, resp)
+
+        def do_POST(self):
+            # Drain any body so it isn't parsed as the next request on this keep-alive connection
+            try:
+                length = int(self.headers.get("Content-Length") or 0)
+            except ValueError:
+                length, self.close_connection = 0, True
+            if length:
+                self.rfile.read(length)
+            url = urlsplit(self.path)
+            query = {k: v[-1] for k, v in parse_qs(url.query).items()}
+            if url.path.rstrip("/") != "/admin/cache/invalidate":
+                self._send(404, _json({"error": f"No route for {url.path}."}))
+                return
+            if "cik" in query:
+                n = api.cache.invalidate_tag(cik_tag(query["cik"].zfill(10)))
+            elif not CACHE_ADMIN:
+                # Dropping everything makes every client refetch from EDGAR; same switch as the UI's "Clear all"
+                self._send(403, _json({"error": "Clearing the whole cache needs CACHE_ADMIN=1; pass cik=... to drop one company."}))
+                return
+            else:
+                n = api.cache.stats()["entries"]
+                api.cache.clear()
+            self._send(200, _json({"invalidated": n}, cacheable=False))
+
+        def _send(self, status: int, resp: Response, body: bool = True):
+            payload = resp.body
+            gzipped = (body and len(payload) >= GZIP_MIN_BYTES
+                       and "gzip" in self.headers.get("Accept-Encoding", ""))
+            if gzipped:
+                payload = gzip.compress(payload, compresslevel=5)
+            self.send_response(status)
+            self.send_header("ETag", resp.etag)
+            # Only fresh successes may be reused; errors, /health and degraded answers must not be
+            fresh = status in (200, 304) and resp.cacheable and not resp.degraded
+            self.send_header("Cache-Control", f"max-age={API_MAX_AGE_S}" if fresh else "no-store")
+            self.send_header("Vary", "Accept-Encoding")
+            if status != 304:
+                self.send_header("Content-Type", resp.content_type)
+                if resp.filename:
+                    self.send_header("Content-Disposition", f'attachment; filename="{resp.filename}"')
+            if resp.stale_since is not None:
+                ts = datetime.fromtimestamp(resp.stale_since, tz=timezone.utc).strftime("%a, %d %b %Y %H:%M:%S GMT")
+                self.send_header("Warning", '110 - "Response is Stale"')
+                self.send_header("X-Data-As-Of", ts)
+            if resp.missing:
+                self.send_header("Warning", f'199 - "Incomplete: {resp.missing} EDGAR request(s) timed out"')
+                self.send_header("X-Missing-Requests", str(resp.missing))
+            if gzipped:
+                self.send_header("Content-Encoding", "gzip")
+            self.send_header("Content-Length", str(len(payload) if body else 0))
+            self.end_headers()
+            if body:
+                self.wfile.write(payload)
+
+        def log_message(self, fmt, *args):
+            pass
+    return Handler
+
+def make_server(host: str = "127.0.0.1", port: int = API_PORT,
+                fetcher: Optional[SECDataFetcher] = None) -> ThreadingHTTPServer:
+    fetcher = fetcher or SECDataFetcher(cache=SizeAwareCache(CACHE_MAX_BYTES, CACHE_POLICY))
+    server = ThreadingHTTPServer((host, port), make_handler(FinancialApi(fetcher)))
+    server.daemon_threads = True
+    return server
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description="Headless JSON/CSV/Arrow API for SEC financial tables")
+    ap.add_argument("--host", default="127.0.0.1")
+    ap.add_argument("--port", type=int, default=API_PORT)
+    args = ap.parse_args()
+    srv = make_server(args.host, args.port)
+    print(f"Financial API on http://{args.host}:{srv.server_port}", flush=True)
+    srv.serve_forever()
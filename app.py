@@ -2,22 +2,35 @@
 import streamlit as st
 import pandas as pd
 from datetime import datetime
-from utils.cache import get_resource, cached_data
-from services.sec_api import SECDataFetcher
-from services.transforms import build_financial_table, compute_changes
+from utils.cache import get_resource, cached_table, shared_cache
+from services.sec_api import SECDataFetcher, cik_tag
+from services.transforms import build_financial_table, compute_changes, build_history_table
+from services.columnar import arrow_available, to_arrow_ipc, to_parquet
+from services.formatting import format_for_display
 from ui.company_picker import render as pick_company
-from ui.summary_table import format_for_display, editable_table
+from ui.summary_table import editable_table
 from ui.charts import plot_metric
-from ui.exports import render_downloads_combined 
+from ui.exports import render_downloads_combined, render_columnar_downloads
 from ui.segments_manual import render_manual_segments
 from ui.segments_freeform import render_freeform_segments
-from config import COMMON_TAGS
+from ui.screener import render_screener
+from services.fsds import lookup_segments
+from ui.cache_admin import render_cache_admin
+from utils.components import staleness_notice
+from config import COMMON_TAGS, PAGE_BUDGET_S, CACHE_ADMIN
 
 st.set_page_config(page_title="SEC Financial Dashboard", layout="wide")
 st.title("📊 SEC Financial Dashboard (EDGAR)")
 
 # 1) Resource (cached)
-fetcher = get_resource(lambda: SECDataFetcher())
+fetcher = get_resource(lambda: SECDataFetcher(cache=shared_cache()))
+if CACHE_ADMIN:
+    render_cache_admin(shared_cache())
+
+mode = st.sidebar.radio("Mode", ["Company Dashboard", "Sector Screener"], key="app_mode")
+if mode == "Sector Screener":
+    render_screener(fetcher)
+    st.stop()
 
 # 2) Company picker
 company = pick_company(fetcher)
@@ -25,22 +38,31 @@ if not company:
     st.info("Select a company to begin.")
     st.stop()
 
-# 3) Resolve CIK + revenue tag
-cik = fetcher.get_company_cik(company)
-if not cik:
-    st.error(f"Could not find CIK for {company}.")
-    st.stop()
-
-revenue_tag = fetcher.best_revenue_tag(company, cik)
-st.info(f"**Selected Company:** {company} | **CIK:** {cik} | **Revenue Tag:** {revenue_tag}")
-
-# 4) Load & cache data
-@cached_data(ttl=3600)
+@cached_table("table", ttl=3600, tags=lambda cik, *_: [cik_tag(cik)])
 def load(cik: str, revenue_tag: str, company_name: str):
     return build_financial_table(cik, revenue_tag, fetcher)
 
-with st.spinner(f"Loading financial data for {company}..."):
-    df = load(cik, revenue_tag, company)
+# 3) + 4) Resolve CIK + revenue tag, load & cache data — all within one latency budget
+with fetcher.page_budget(PAGE_BUDGET_S) as page:
+    cik = fetcher.get_company_cik(company)
+    if not cik:
+        st.error(f"Could not find CIK for {company}.")
+        st.stop()
+
+    revenue_tag = fetcher.best_revenue_tag(company, cik)
+    if revenue_tag is None:
+        staleness_notice(page)
+        st.error(f"EDGAR did not answer in time to pick a revenue tag for {company}. Rerun to retry.")
+        st.stop()
+    st.info(f"**Selected Company:** {company} | **CIK:** {cik} | **Revenue Tag:** {revenue_tag}")
+
+    with st.spinner(f"Loading financial data for {company}..."):
+        df = load(cik, revenue_tag, company)
+
+if page.degraded:
+    # Don't keep a table built from stale/missing responses; the next rerun retries EDGAR
+    load.invalidate(cik, revenue_tag, company)
+    staleness_notice(page)
 
 if df.empty:
     st.warning(f"No financial data available for {company}.")
@@ -128,7 +150,8 @@ include_notes = st.checkbox("Include a section-level Notes box", value=False, ke
 notes_text = st.text_area("Notes", placeholder="Add context or takeaways…", height=140, key="fin_notes_text") if include_notes else ""
 
 # --- Freeform segments table (prefilled & editable) ---
-segments_df = render_freeform_segments()
+segment_prefill = lookup_segments(cik, selected_q)
+segments_df = render_freeform_segments(prefill=segment_prefill, prefill_key=f"{cik}:{selected_q}")
 
 # --- One set of buttons that download BOTH sections together ---
 render_downloads_combined(
@@ -137,4 +160,44 @@ render_downloads_combined(
     notes_text=notes_text,
     include_notes=include_notes,
     segments_df=segments_df,
-)
\ No newline at end of file
+)
+
+# 8) Typed history export (Parquet / Arrow), built only on request and cached per company set
+@cached_table("history_export", ttl=3600, tags=lambda key, *_: [cik_tag(cik) for _, cik, _ in key])
+def history_exports(key: tuple, _tables: dict) -> dict:
+    history = build_history_table(_tables)
+    return {"parquet": to_parquet(history), "arrow": to_arrow_ipc(history), "rows": len(history)}
+
+st.subheader("📦 Typed History Export")
+history_title = f"{company} — Quarterly History"
+if not arrow_available():
+    render_columnar_downloads(None, history_title)
+elif st.toggle("Prepare Parquet / Arrow files", key="history_export_on",
+               help="Builds the files on demand; each added company costs its own EDGAR requests"):
+    peers = st.multiselect("Add companies to the export",
+                           options=[c["name"] for c in fetcher.get_company_list() if c["name"] != company],
+                           key="history_peers", help="Type to search all SEC-registered companies")
+    # Peers share whatever is left of this page's budget rather than starting a new one
+    seen = len(page.stale)
+    with fetcher.resume(page):
+        resolved, skipped = [(company, cik, revenue_tag)], []
+        for peer in peers:
+            peer_cik = fetcher.get_company_cik(peer)
+            peer_tag = fetcher.best_revenue_tag(peer, peer_cik) if peer_cik else None
+            if peer_tag:
+                resolved.append((peer, peer_cik, peer_tag))
+            else:
+                skipped.append(peer)
+        key = tuple(resolved)
+        tables = {(company, cik): df, **{(name, c): load(c, tag, name) for name, c, tag in resolved[1:]}}
+        exports = history_exports(key, tables)
+    if page.degraded:
+        # Neither the export nor any table built in this budget should outlive the retry
+        history_exports.invalidate(key)
+        for name, c, tag in resolved[1:]:
+            load.invalidate(c, tag, name)
+        if len(page.stale) > seen:  # the notice above already covers the main table
+            staleness_notice(page)
+    if skipped:
+        st.warning(f"Left out of the export (no data in time): {', '.join(skipped)}")
+    render_columnar_downloads(exports, history_title)
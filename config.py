@@ -1,6 +1,12 @@
 # config.py
+import os
+
 DEFAULT_USER_AGENT = "ishavarrier@address.com"
 
+# Base URLs for EDGAR; override to point the app at a local stub server (see tools/stub_edgar.py)
+SEC_WWW_URL = os.environ.get("SEC_WWW_URL", "https://www.sec.gov")
+SEC_DATA_URL = os.environ.get("SEC_DATA_URL", "https://data.sec.gov")
+
 COMPANY_REVENUE_PREFERENCES = {
     "Intel": ["RevenueFromContractWithCustomerExcludingAssessedTax"],
     "Texas Instruments": ["RevenueFromContractWithCustomerExcludingAssessedTax","SalesRevenueNet"],
@@ -40,3 +46,36 @@ DEFAULT_MARKETS = [
     "Enterprise systems",
     "Calculators",
 ]
+
+# Cross-sectional screener (XBRL frames API)
+SCREEN_METRICS = {
+    "Revenue": DEFAULT_REVENUE_TAGS,
+    "Gross Profit": ["GrossProfit"],
+    "Net Income": ["NetIncomeLoss"],
+    "Cash Flow": ["NetCashProvidedByUsedInOperatingActivities"],
+}
+SCREEN_MAX_SIC_LOOKUPS = 200
+
+# SEC Financial Statement Data Sets → on-disk segment index (see services/fsds.py)
+FSDS_INDEX_PATH = os.environ.get("FSDS_INDEX_PATH", "data/fsds_segments.sqlite")
+FSDS_CHUNK_ROWS = 250_000
+
+# In-process cache for tables, concepts and lookups (see utils/sized_cache.py)
+CACHE_MAX_BYTES = int(os.environ.get("CACHE_MAX_MB", "512")) * 2**20
+CACHE_POLICY = os.environ.get("CACHE_POLICY", "lru")  # "lru" or "lfu"
+CONCEPT_TTL = 3600
+CACHE_ADMIN = os.environ.get("CACHE_ADMIN", "") == "1"  # cache admin panel (incl. "Clear all") and API clear-all
+
+# Per-page latency budget and hedged requests (see SECDataFetcher.page_budget)
+PAGE_BUDGET_S = 8.0
+SCREEN_BUDGET_S = 30.0        # the screener pulls ~18 frames of several MB each
+REQUEST_TIMEOUT_S = 30
+HEDGE_PERCENTILE = 95          # send a duplicate once a request is slower than this percentile
+HEDGE_DELAY_BOUNDS_S = (0.05, 2.0)
+HEDGE_DEFAULT_DELAY_S = 1.0    # used until enough latencies are recorded
+HEDGE_MAX_IN_FLIGHT = 4        # hedges beyond this are skipped rather than queued
+
+# Headless API service (see api_server.py)
+API_PORT = int(os.environ.get("API_PORT", "8600"))
+API_BUDGET_S = 10.0
+API_MAX_AGE_S = 300
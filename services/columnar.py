@@ -0,0 +1,38 @@
+# services/columnar.py
+#This file serializes financial tables to typed columnar formats (Arrow IPC, Parquet) without per-cell formatting.
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # optional: only needed for Arrow/Parquet exports
+    pa = pq = None
+
+ARROW_MIME = "application/vnd.apache.arrow.stream"
+PARQUET_MIME = "application/vnd.apache.parquet"
+
+def arrow_available() -> bool:
+    return pa is not None
+
+def _require_pyarrow():
+    if pa is None:
+        raise RuntimeError("Arrow/Parquet export needs pyarrow (pip install pyarrow).")
+
+def to_arrow_table(df: pd.DataFrame):
+    _require_pyarrow()
+    return pa.Table.from_pandas(df, preserve_index=False)
+
+def to_arrow_ipc(df: pd.DataFrame) -> bytes:
+    """Arrow IPC stream bytes; read back with pyarrow.ipc.open_stream(...).read_pandas()."""
+    table = to_arrow_table(df)
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes()
+
+def to_parquet(df: pd.DataFrame, compression: str = "zstd") -> bytes:
+    """Parquet file bytes; read back with pandas.read_parquet(io.BytesIO(...)) or polars.read_parquet."""
+    table = to_arrow_table(df)
+    sink = pa.BufferOutputStream()
+    pq.write_table(table, sink, compression=compression)
+    return sink.getvalue().to_pybytes()
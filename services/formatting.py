@@ -0,0 +1,91 @@
+# services/formatting.py
+#This file renders financial summaries as display strings, plaintext tables and CSV blocks,
+#shared by the dashboard's exports and the headless API (no Streamlit imports here).
+import pandas as pd
+from datetime import datetime
+from typing import List, Optional
+
+def format_for_display(current, qoq, yoy) -> pd.DataFrame:
+    combined = pd.DataFrame({"Current": current, "QoQ Change": qoq, "YoY Change": yoy})
+    def _fmt(row):
+        out = {}
+        for col, val in row.items():
+            if isinstance(val, float):
+                if "Margin" in row.name:
+                    out[col] = f"{val:.1%}"
+                elif "Change" in col:
+                    out[col] = f"{val:.1%}"
+                else:
+                    out[col] = f"${val:,.0f}"
+            else:
+                out[col] = val
+        return pd.Series(out)
+    return combined.apply(_fmt, axis=1)
+
+def _clean_df_for_text(df: pd.DataFrame) -> pd.DataFrame:
+    if df is None or df.empty:
+        return pd.DataFrame(columns=["(empty)"])
+    out = df.copy()
+    # stringify and remove 'nan'
+    for c in out.columns:
+        out[c] = out[c].apply(lambda v: "" if pd.isna(v) or str(v).lower() == "nan" else str(v))
+    return out
+
+def _is_numeric_cell(s: str) -> bool:
+    if not s or s.strip() == "": return False
+    # accept plain numbers or currency/percent-looking values
+    t = s.replace(",", "").replace("$", "").replace("€", "").replace("%", "")
+    try:
+        float(t)
+        return True
+    except ValueError:
+        return False
+
+def _render_ascii_table(df: pd.DataFrame) -> str:
+    """Pretty monospace ASCII with right-aligned numeric columns."""
+    df2 = _clean_df_for_text(df)
+    cols = list(df2.columns)
+
+    # decide alignment per column
+    right_align = []
+    for c in cols:
+        sample_vals = df2[c].dropna().astype(str).head(20).tolist()
+        right_align.append(any(_is_numeric_cell(v) for v in sample_vals))
+
+    # width calc
+    widths = []
+    for i, c in enumerate(cols):
+        data_lens = [len(v) for v in df2[c].astype(str).tolist()]
+        widths.append(max(len(str(c)), *(data_lens or [0])))
+
+    def fmt_cell(txt, i):
+        txt = str(txt)
+        return txt.rjust(widths[i]) if right_align[i] else txt.ljust(widths[i])
+
+    header = " | ".join(fmt_cell(c, i) for i, c in enumerate(cols))
+    sep    = "-+-".join("-" * w for w in widths)
+    body   = "\n".join(" | ".join(fmt_cell(df2.iloc[r, i], i) for i in range(len(cols)))
+                       for r in range(len(df2)))
+
+    return f"{header}\n{sep}\n{body if body else ''}"
+
+def to_plaintext_combined(
+    summary_df: pd.DataFrame,
+    segments_df: Optional[pd.DataFrame],
+    title: str,
+    notes_text: str = ""
+) -> str:
+    ts = datetime.now().strftime("%Y-%m-%d %H:%M")
+    parts: List[str] = [f"{title}\nGenerated: {ts}\n"]
+    parts.append("Financial Summary")
+    parts.append(_render_ascii_table(summary_df))
+    if notes_text.strip():
+        parts.append("\nNotes\n" + notes_text.strip())
+    if segments_df is not None and not segments_df.empty:
+        parts.append("\nMarkets / Sectors (Manual)")
+        parts.append(_render_ascii_table(segments_df))
+    return "\n".join(parts).strip() + "\n"
+
+def to_csv_block(df: pd.DataFrame) -> str:
+    """Return CSV block (header+rows) for a DF."""
+    return df.to_csv(index=False, lineterminator="\n")
@@ -0,0 +1,153 @@
+# services/fsds.py
+#This file ingests the SEC Financial Statement Data Sets (quarterly sub.txt/num.txt zips) into a
+#small on-disk index of segment-dimensioned revenue facts, keyed by (cik, period).
+#
+#   python -m services.fsds 2024q1.zip 2024q2.zip --index data/fsds_segments.sqlite
+import argparse
+import csv
+import os
+import sqlite3
+import zipfile
+import pandas as pd
+from datetime import timedelta
+from typing import Iterable, List, Tuple
+from config import DEFAULT_REVENUE_TAGS, FSDS_INDEX_PATH, FSDS_CHUNK_ROWS
+from services.screening import shift_period
+
+FORMS = {"10-Q", "10-K", "10-Q/A", "10-K/A"}
+NUM_COLUMNS = ["adsh", "tag", "ddate", "qtrs", "uom", "segments", "coreg", "value"]
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS segment_facts (
+    cik TEXT NOT NULL, period TEXT NOT NULL, tag TEXT NOT NULL, segments TEXT NOT NULL,
+    ddate TEXT NOT NULL, value REAL NOT NULL, adsh TEXT NOT NULL,
+    PRIMARY KEY (cik, period, tag, segments)
+);
+CREATE TABLE IF NOT EXISTS ingested (source TEXT PRIMARY KEY, rows INTEGER NOT NULL);
+"""
+
+def period_label(ddate: pd.Series) -> pd.Series:
+    """Quarter-end dates (YYYYMMDD) → calendar-quarter labels like the frames API ('CY2024Q1')."""
+    # 52/53-week filers end quarters a few weeks off calendar; shift back so late-January
+    # ends (e.g. NVIDIA) land in the prior calendar Q4, as EDGAR's frames do.
+    d = pd.to_datetime(ddate, format="%Y%m%d") - timedelta(days=45)
+    return "CY" + d.dt.year.astype(str) + "Q" + d.dt.quarter.astype(str)
+
+def parse_segments(segments: str) -> List[Tuple[str, str]]:
+    """'BusinessSegments=DataCenter;' → [('BusinessSegments', 'DataCenter')]"""
+    out = []
+    for part in str(segments or "").split(";"):
+        if "=" in part:
+            axis, member = part.split("=", 1)
+            out.append((axis.strip(), member.strip()))
+    return out
+
+def _read_tsv(zf: zipfile.ZipFile, name: str, **kwargs):
+    return pd.read_csv(zf.open(name), sep="\t", dtype=str, quoting=csv.QUOTE_NONE,
+                       keep_default_na=False, encoding="utf-8", encoding_errors="replace", **kwargs)
+
+def connect(index_path: str = FSDS_INDEX_PATH) -> sqlite3.Connection:
+    os.makedirs(os.path.dirname(index_path) or ".", exist_ok=True)
+    con = sqlite3.connect(index_path)
+    con.executescript(_SCHEMA)
+    return con
+
+def ingest_zip(zip_path: str, index_path: str = FSDS_INDEX_PATH, chunksize: int = FSDS_CHUNK_ROWS,
+               tags: Iterable[str] = DEFAULT_REVENUE_TAGS, force: bool = False) -> int:
+    """
+    Stream one quarterly data-set zip into the index and return the number of facts written.
+    num.txt is read chunksize rows at a time, so memory stays bounded regardless of file size.
+    """
+    source = os.path.basename(zip_path)
+    tags = set(tags)
+    con = connect(index_path)
+    try:
+        if not force and con.execute("SELECT 1 FROM ingested WHERE source = ?", (source,)).fetchone():
+            return 0
+
+        with zipfile.ZipFile(zip_path) as zf:
+            sub = _read_tsv(zf, "sub.txt", usecols=["adsh", "cik", "form"])
+            sub = sub[sub["form"].isin(FORMS)]
+            cik_by_adsh = dict(zip(sub["adsh"], sub["cik"].str.zfill(10)))
+            del sub
+
+            header = _read_tsv(zf, "num.txt", nrows=0).columns
+            if "segments" not in header:
+                raise ValueError(f"{source}: num.txt has no 'segments' column (dimensional facts need the 2024+ layout).")
+
+            written = 0
+            for chunk in _read_tsv(zf, "num.txt", usecols=NUM_COLUMNS, chunksize=chunksize):
+                chunk = chunk[chunk["tag"].isin(tags) & (chunk["uom"] == "USD") & (chunk["qtrs"] == "1")
+                              & (chunk["segments"] != "") & (chunk["coreg"] == "") & (chunk["value"] != "")]
+                chunk = chunk.assign(cik=chunk["adsh"].map(cik_by_adsh)).dropna(subset=["cik"])
+                if chunk.empty:
+                    continue
+                chunk = chunk.assign(period=period_label(chunk["ddate"]), value=chunk["value"].astype(float))
+                rows = chunk[["cik", "period", "tag", "segments", "ddate", "value", "adsh"]].itertuples(index=False, name=None)
+                con.executemany("INSERT OR REPLACE INTO segment_facts VALUES (?, ?, ?, ?, ?, ?, ?)", rows)
+                written += len(chunk)
+
+        con.execute("INSERT OR REPLACE INTO ingested VALUES (?, ?)", (source, written))
+        con.commit()
+        return written
+    finally:
+        con.close()
+
+def _single_axis(facts: pd.DataFrame) -> pd.DataFrame:
+    """Keep the revenue tag / single axis that best describes the segment split."""
+    parsed = facts["segments"].apply(parse_segments)
+    facts = facts[parsed.str.len() == 1].copy()
+    if facts.empty:
+        return facts
+    facts["Axis"] = parsed[facts.index].str[0].str[0]
+    facts["Segment"] = parsed[facts.index].str[0].str[1]
+    tag_rank = {t: i for i, t in enumerate(DEFAULT_REVENUE_TAGS)}
+    facts = facts.assign(_tag_rank=facts["tag"].map(tag_rank).fillna(len(tag_rank)))
+    facts = facts[facts["_tag_rank"] == facts["_tag_rank"].min()]
+    # Prefer business segments, then whichever axis has the most members
+    counts = facts.groupby("Axis")["Segment"].nunique()
+    business = [a for a in counts.index if "Segment" in a]
+    axis = business[0] if business else counts.idxmax()
+    return facts[facts["Axis"] == axis]
+
+def lookup_segments(cik: str, period: str, index_path: str = FSDS_INDEX_PATH) -> pd.DataFrame:
+    """
+    Segment revenue for one company/quarter from the local index. Returns:
+    ['Axis','Segment','Revenue','Share','QoQ Change','YoY Change'] (empty if not indexed).
+    """
+    cols = ["Axis", "Segment", "Revenue", "Share", "QoQ Change", "YoY Change"]
+    if not os.path.exists(index_path) or not period.startswith("CY"):
+        return pd.DataFrame(columns=cols)
+
+    prev_q, prev_y = shift_period(period, -1), shift_period(period, -4)
+    con = sqlite3.connect(index_path)
+    try:
+        facts = pd.read_sql_query(
+            "SELECT period, tag, segments, value FROM segment_facts WHERE cik = ? AND period IN (?, ?, ?)",
+            con, params=(cik, period, prev_q, prev_y))
+    finally:
+        con.close()
+
+    current = _single_axis(facts[facts["period"] == period])
+    if current.empty:
+        return pd.DataFrame(columns=cols)
+
+    out = current[["Axis", "Segment", "tag", "segments", "value"]].rename(columns={"value": "Revenue"})
+    for label, ref in [("QoQ Change", prev_q), ("YoY Change", prev_y)]:
+        ref_vals = facts[facts["period"] == ref].set_index(["tag", "segments"])["value"]
+        prior = pd.Series([ref_vals.get((t, s)) for t, s in zip(out["tag"], out["segments"])], index=out.index, dtype=float)
+        out[label] = ((out["Revenue"] - prior) / prior.abs()).where(prior.notna() & (prior != 0))
+    total = out["Revenue"].sum()
+    out["Share"] = out["Revenue"] / total if total else float("nan")
+    return out.sort_values("Revenue", ascending=False)[cols].reset_index(drop=True)
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description="Index segment revenue from SEC Financial Statement Data Sets zips")
+    ap.add_argument("zips", nargs="+", help="Quarterly data-set zips, e.g. 2024q1.zip")
+    ap.add_argument("--index", default=FSDS_INDEX_PATH)
+    ap.add_argument("--chunksize", type=int, default=FSDS_CHUNK_ROWS)
+    ap.add_argument("--force", action="store_true", help="Re-ingest zips already in the index")
+    args = ap.parse_args()
+    for path in args.zips:
+        n = ingest_zip(path, args.index, args.chunksize, force=args.force)
+        print(f"{os.path.basename(path)}: {n:,} segment facts")
@@ -0,0 +1,114 @@
+# services/screening.py
+#This file builds cross-sectional screens (every filer, one period) from the SEC XBRL frames API.
+import re
+import pandas as pd
+from typing import Dict, Optional, Tuple
+from config import SCREEN_METRICS, SCREEN_MAX_SIC_LOOKUPS
+
+_PERIOD_RE = re.compile(r"^CY(\d{4})Q([1-4])$")
+
+def parse_frame(json_data: Dict) -> pd.DataFrame:
+    records = [{
+        "cik": str(entry["cik"]).zfill(10),
+        "Company": entry.get("entityName", ""),
+        "end": entry.get("end", ""),
+        "val": entry["val"],
+    } for entry in json_data.get("data", []) if "cik" in entry and "val" in entry]
+    return pd.DataFrame(records, columns=["cik", "Company", "end", "val"])
+
+def shift_period(period: str, quarters: int) -> str:
+    """'CY2024Q1' shifted by -1 → 'CY2023Q4'; by -4 → 'CY2023Q1'."""
+    m = _PERIOD_RE.match(period)
+    if not m:
+        raise ValueError(f"Period must look like CY2024Q1, got {period!r}.")
+    idx = int(m.group(1)) * 4 + int(m.group(2)) - 1 + quarters
+    return f"CY{idx // 4}Q{idx % 4 + 1}"
+
+def metric_frame(fetcher, metric: str, period: str) -> pd.DataFrame:
+    """One row per filer for a metric; tags are tried in preference order, first hit per CIK wins."""
+    parts = []
+    for tag in SCREEN_METRICS[metric]:
+        js = fetcher.fetch_frame(tag, period)
+        if js:
+            df = parse_frame(js)
+            if not df.empty:
+                parts.append(df)
+    if not parts:
+        return pd.DataFrame(columns=["cik", "Company", metric])
+    out = pd.concat(parts, ignore_index=True).drop_duplicates(subset=["cik"], keep="first")
+    return out.rename(columns={"val": metric})[["cik", "Company", metric]]
+
+def build_screen(fetcher, period: str, metric: str = "Revenue") -> pd.DataFrame:
+    """
+    Cross-sectional table for one period:
+    ['CIK','Company','Ticker',<metric>,'QoQ Growth','YoY Growth','Gross Margin', '<col> Pctl'...]
+    """
+    current = metric_frame(fetcher, metric, period)
+    if current.empty:
+        return pd.DataFrame()
+
+    df = current
+    for label, lag in [("QoQ Growth", -1), ("YoY Growth", -4)]:
+        ref = metric_frame(fetcher, metric, shift_period(period, lag))[["cik", metric]]
+        df = df.merge(ref.rename(columns={metric: "_ref"}), on="cik", how="left")
+        valid = df["_ref"].notna() & (df["_ref"] != 0)
+        df[label] = ((df[metric] - df["_ref"]) / df["_ref"].abs()).where(valid)
+        df = df.drop(columns=["_ref"])
+
+    rev = current if metric == "Revenue" else metric_frame(fetcher, "Revenue", period)
+    gp = current if metric == "Gross Profit" else metric_frame(fetcher, "Gross Profit", period)
+    if not rev.empty and not gp.empty:
+        margin = rev[["cik", "Revenue"]].merge(gp[["cik", "Gross Profit"]], on="cik")
+        margin = margin[margin["Revenue"] != 0]
+        margin["Gross Margin"] = margin["Gross Profit"] / margin["Revenue"]
+        df = df.merge(margin[["cik", "Gross Margin"]], on="cik", how="left")
+    else:
+        df["Gross Margin"] = float("nan")
+
+    tickers = {c["cik"]: c["ticker"] for c in fetcher.get_company_list()}
+    df.insert(2, "Ticker", df["cik"].map(tickers).fillna(""))
+    df = df.rename(columns={"cik": "CIK"})
+
+    df = add_percentiles(df, [metric, "QoQ Growth", "YoY Growth", "Gross Margin"])
+    return df.sort_values(metric, ascending=False).reset_index(drop=True)
+
+def add_percentiles(df: pd.DataFrame, columns) -> pd.DataFrame:
+    """'<col> Pctl' = percentile rank of each row among df's own rows (recompute after filtering)."""
+    df = df.copy()
+    for col in columns:
+        df[f"{col} Pctl"] = df[col].rank(pct=True)
+    return df
+
+def filter_by_sic(screen: pd.DataFrame, fetcher, sic_prefix: str,
+                  max_lookups: int = SCREEN_MAX_SIC_LOOKUPS) -> Tuple[pd.DataFrame, int, int]:
+    """
+    Keep rows whose SIC code starts with sic_prefix (e.g. '367' for semiconductors).
+    SIC codes come from one submissions call per company, so only the first
+    max_lookups rows (in the screen's current order) are checked. Returns
+    (filtered, rows left unchecked, lookups that ran out of budget); both kinds
+    of row are missing from the result. Percentiles are re-ranked within the sector.
+    """
+    unresolved = object()
+    head = screen.head(max_lookups).copy()
+    info = [fetcher.get_company_sic(cik, unavailable=unresolved) for cik in head["CIK"]]
+    n_unresolved = sum(1 for i in info if i is unresolved)
+    info = [{} if i is None or i is unresolved else i for i in info]
+    head["SIC"] = [i.get("sic", "") for i in info]
+    head["Industry"] = [i.get("sicDescription", "") for i in info]
+    out = head[head["SIC"].str.startswith(sic_prefix)].reset_index(drop=True)
+    pctl_cols = [c[:-len(" Pctl")] for c in out.columns if c.endswith(" Pctl")]
+    return add_percentiles(out, pctl_cols), len(screen) - len(head), n_unresolved
+
+def rank_table(screen: pd.DataFrame, sort_by: str, ascending: bool = False) -> pd.DataFrame:
+    out = screen.dropna(subset=[sort_by]).sort_values(sort_by, ascending=ascending).reset_index(drop=True)
+    out.insert(0, "Rank", range(1, len(out) + 1))
+    return out
+
+def peer_rank(screen: pd.DataFrame, cik: str, column: str) -> Optional[Tuple[int, int]]:
+    """(rank, peers) of one company on a column among the screen's rows (1 = highest)."""
+    ranked = screen.dropna(subset=[column])
+    row = ranked[ranked["CIK"] == cik]
+    if row.empty:
+        return None
+    rank = int(ranked[column].rank(ascending=False, method="min")[row.index[0]])
+    return rank, len(ranked)
@@ -1,22 +1,200 @@
 # services/sec_api.py 
 #This file handles interactions with the SEC EDGAR API to fetch company financial data.
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from contextlib import contextmanager
 import requests
-from typing import Dict, List, Optional
-from config import DEFAULT_USER_AGENT, COMPANY_REVENUE_PREFERENCES, DEFAULT_REVENUE_TAGS
+from typing import Any, Callable, Dict, Hashable, Iterable, List, Optional, Tuple
+from config import (DEFAULT_USER_AGENT, COMPANY_REVENUE_PREFERENCES, DEFAULT_REVENUE_TAGS,
+                    SEC_WWW_URL, SEC_DATA_URL, CACHE_MAX_BYTES, CACHE_POLICY, CONCEPT_TTL,
+                    REQUEST_TIMEOUT_S, HEDGE_PERCENTILE, HEDGE_DELAY_BOUNDS_S, HEDGE_DEFAULT_DELAY_S,
+                    HEDGE_MAX_IN_FLIGHT)
+from utils.sized_cache import SizeAwareCache
+
+_UNKNOWN = object()
+
+def cik_tag(cik: str) -> str:
+    """Cache tag grouping every entry that belongs to one company."""
+    return f"cik:{cik}"
+
+class DeadlineExceeded(Exception):
+    pass
+
+class PageLoad:
+    """Latency budget for one page load; records requests answered from stale cache (or not at all)."""
+
+    def __init__(self, seconds: float):
+        self.deadline = time.monotonic() + seconds
+        self.stale: Dict[str, Optional[float]] = {}  # url -> fetched_at (epoch s) of the copy served, None if none
+
+    def remaining(self) -> float:
+        return self.deadline - time.monotonic()
+
+    @property
+    def degraded(self) -> bool:
+        return bool(self.stale)
+
+    @property
+    def oldest(self) -> Optional[float]:
+        served = [t for t in self.stale.values() if t is not None]
+        return min(served) if served else None
+
+    @property
+    def missing(self) -> int:
+        return sum(1 for t in self.stale.values() if t is None)
+
+class _LatencyTracker:
+    def __init__(self, window: int = 200, min_samples: int = 20):
+        self._samples = deque(maxlen=window)
+        self._min_samples = min_samples
+        self._lock = threading.Lock()
+
+    def record(self, seconds: float):
+        with self._lock:
+            self._samples.append(seconds)
+
+    def hedge_delay(self) -> float:
+        with self._lock:
+            if len(self._samples) < self._min_samples:
+                return HEDGE_DEFAULT_DELAY_S
+            ordered = sorted(self._samples)
+        value = ordered[min(len(ordered) - 1, int(len(ordered) * HEDGE_PERCENTILE / 100))]
+        lo, hi = HEDGE_DELAY_BOUNDS_S
+        return min(hi, max(lo, value))
 
 class SECDataFetcher:
-    def __init__(self, user_agent: str = DEFAULT_USER_AGENT):
+    def __init__(self, user_agent: str = DEFAULT_USER_AGENT,
+                 www_url: str = SEC_WWW_URL, data_url: str = SEC_DATA_URL,
+                 cache: Optional[SizeAwareCache] = None):
         self.headers = {"User-Agent": user_agent}
-        self._cik_cache: Dict[str,str] = {}
+        self.www_url = www_url.rstrip("/")
+        self.data_url = data_url.rstrip("/")
+        # Name→CIK lookups, concepts, frames and SIC info live in one memory-bounded cache
+        self.cache = cache if cache is not None else SizeAwareCache(CACHE_MAX_BYTES, CACHE_POLICY)
         self._company_list_cache: Optional[List[Dict]] = None
+        self._pool = ThreadPoolExecutor(max_workers=16, thread_name_prefix="sec-fetch")
+        # Hedges get their own workers, one per slot, so they never queue behind (or block) first tries
+        self._hedge_pool = ThreadPoolExecutor(max_workers=HEDGE_MAX_IN_FLIGHT, thread_name_prefix="sec-hedge")
+        self._hedge_slots = threading.BoundedSemaphore(HEDGE_MAX_IN_FLIGHT)
+        self._latency = _LatencyTracker()
+        self._local = threading.local()  # Streamlit runs each session's script on its own thread
+        self.hedges = 0
+        self._hedges_lock = threading.Lock()
+
+    # ----------------- latency budget, hedging & stale fallback -----------------
+
+    @contextmanager
+    def page_budget(self, seconds: float):
+        """
+        Bound every fetch made on this thread inside the block to one overall deadline.
+        Once it passes, cached copies are served even if older than their TTL; check
+        page.degraded afterwards to show a staleness marker.
+        """
+        with self.resume(PageLoad(seconds)) as page:
+            yield page
+
+    @contextmanager
+    def resume(self, page: PageLoad):
+        """Fetch inside the block against an existing page's deadline, e.g. a later section of the same page."""
+        outer = getattr(self._local, "page", None)
+        self._local.page = page
+        try:
+            yield page
+        finally:
+            self._local.page = outer
+
+    def _send(self, url: str, deadline: float, started: Optional[threading.Event] = None) -> Tuple[int, Any]:
+        if started is not None:
+            started.set()
+        timeout = deadline - time.monotonic()
+        if timeout <= 0:  # sat in the queue past the caller's deadline
+            raise DeadlineExceeded(url)
+        start = time.monotonic()
+        r = requests.get(url, headers=self.headers, timeout=timeout)
+        if r.status_code == 429 or r.status_code >= 500:
+            r.raise_for_status()
+        self._latency.record(time.monotonic() - start)
+        return r.status_code, (r.json() if r.status_code == 200 else None)
+
+    def _hedged_get(self, url: str) -> Tuple[int, Any]:
+        """
+        GET url; if it outlives the hedge delay once it has started, race a duplicate and take
+        whichever answers first. Hedges are skipped when all HEDGE_MAX_IN_FLIGHT slots are busy.
+        """
+        page = getattr(self._local, "page", None)
+        deadline = time.monotonic() + (REQUEST_TIMEOUT_S if page is None else min(REQUEST_TIMEOUT_S, page.remaining()))
+        def remaining():
+            return deadline - time.monotonic()
+
+        if remaining() <= 0:
+            raise DeadlineExceeded(url)
+        started = threading.Event()
+        futures = [self._pool.submit(self._send, url, deadline, started)]
+        # Time spent queued for a worker says nothing about EDGAR being slow, so the hedge delay
+        # counts from when the request actually went out
+        if started.wait(remaining()):
+            done, _ = wait(futures, timeout=min(self._latency.hedge_delay(), remaining()))
+            if not done and remaining() > 0 and self._hedge_slots.acquire(blocking=False):
+                hedge = self._hedge_pool.submit(self._send, url, deadline)
+                hedge.add_done_callback(lambda _: self._hedge_slots.release())
+                futures.append(hedge)
+                with self._hedges_lock:
+                    self.hedges += 1
+
+        pending, error = set(futures), None
+        try:
+            while pending and remaining() > 0:
+                done, pending = wait(pending, timeout=remaining(), return_when=FIRST_COMPLETED)
+                for f in done:
+                    try:
+                        return f.result()
+                    except requests.RequestException as e:
+                        error = e
+        finally:
+            # A request still queued is dropped; one in flight runs until the deadline (requests
+            # can't be cancelled) and is already bounded by it
+            for f in pending:
+                f.cancel()
+        if error is not None and not pending:
+            raise error
+        raise DeadlineExceeded(url)
+
+    def _get_json(self, key: Hashable, url: str, ttl: Optional[float], tags: Iterable[str] = (),
+                  parse: Callable[[Any], Any] = lambda js: js, unavailable: Any = None) -> Any:
+        """
+        parse(json) for url (json is None on a non-200), cached under key. Past the page
+        deadline, the last cached copy is served regardless of age, or `unavailable` if there
+        is none. Outside a page budget, 429/5xx answers give parse(None) uncached, as any
+        non-200 always did, and network errors raise.
+        """
+        hit = self.cache.get(key)  # (fetched_at, value)
+        if hit is not None and (ttl is None or time.time() - hit[0] < ttl):
+            return hit[1]
+        try:
+            _, js = self._hedged_get(url)
+        except (DeadlineExceeded, requests.RequestException) as e:
+            page = getattr(self._local, "page", None)
+            if page is None:
+                if isinstance(e, requests.HTTPError):
+                    return parse(None)
+                raise
+            page.stale[url] = hit[0] if hit else None
+            return hit[1] if hit else unavailable
+        value = parse(js)
+        self.cache.set(key, (time.time(), value), tags=tags)
+        return value
+
+    # ----------------- EDGAR endpoints -----------------
 
     def get_company_list(self) -> List[Dict]:
         if self._company_list_cache is not None:
             return self._company_list_cache
-        url = "https://www.sec.gov/files/company_tickers.json"
-        r = requests.get(url, headers=self.headers, timeout=30)
-        r.raise_for_status()
-        raw = r.json()
+        url = f"{self.www_url}/files/company_tickers.json"
+        status, raw = self._hedged_get(url)
+        if status != 200:
+            raise requests.HTTPError(f"{status} fetching {url}")
         companies = [{
             "name": v["title"],
             "ticker": v["ticker"],
@@ -27,29 +205,58 @@ class SECDataFetcher:
         return companies
 
     def get_company_cik(self, company_name: str) -> Optional[str]:
-        if company_name in self._cik_cache:
-            return self._cik_cache[company_name]
+        key = ("cik", company_name)
+        cik = self.cache.get(key)
+        if cik is not None:
+            return cik
         for c in self.get_company_list():
             if c["name"] == company_name:
-                self._cik_cache[company_name] = c["cik"]
+                self.cache.set(key, c["cik"], tags=[cik_tag(c["cik"])])
                 return c["cik"]
         return None
 
-    def test_tag_availability(self, cik: str, tag: str) -> bool:
-        url = f"https://data.sec.gov/api/xbrl/companyconcept/CIK{cik}/us-gaap/{tag}.json"
-        r = requests.get(url, headers=self.headers, timeout=30)
-        return r.status_code == 200
+    def test_tag_availability(self, cik: str, tag: str) -> Optional[bool]:
+        """None if it couldn't be checked within the page budget (and nothing was cached)."""
+        # Shares the concept entry: a successful probe is the concept itself
+        js = self._fetch_concept(cik, tag, unavailable=_UNKNOWN)
+        return None if js is _UNKNOWN else js is not None
 
-    def best_revenue_tag(self, company_name: str, cik: str) -> str:
+    def best_revenue_tag(self, company_name: str, cik: str) -> Optional[str]:
+        """
+        First available tag in preference order. None if the budget ran out before a
+        preferred tag could be ruled out — a timeout is not the same as 'tag not filed'.
+        """
         prefs = COMPANY_REVENUE_PREFERENCES.get(company_name, [])
         for t in prefs + DEFAULT_REVENUE_TAGS:
-            if self.test_tag_availability(cik, t):
+            available = self.test_tag_availability(cik, t)
+            if available is None:
+                return None
+            if available:
                 return t
         return "SalesRevenueNet"
 
+    def _fetch_concept(self, cik: str, tag: str, unavailable: Any = None) -> Any:
+        url = f"{self.data_url}/api/xbrl/companyconcept/CIK{cik}/us-gaap/{tag}.json"
+        return self._get_json(("concept", cik, tag), url, ttl=CONCEPT_TTL, tags=[cik_tag(cik)],
+                              unavailable=unavailable)
+
     def fetch_concept(self, cik: str, tag: str) -> Optional[Dict]:
-        url = f"https://data.sec.gov/api/xbrl/companyconcept/CIK{cik}/us-gaap/{tag}.json"
-        r = requests.get(url, headers=self.headers, timeout=30)
-        if r.status_code == 200:
-            return r.json()
-        return None
+        return self._fetch_concept(cik, tag)
+
+    def fetch_frame(self, tag: str, period: str) -> Optional[Dict]:
+        """Every filer's USD value for one tag and period (e.g. 'CY2024Q1'), cached by (tag, period)."""
+        url = f"{self.data_url}/api/xbrl/frames/us-gaap/{tag}/USD/{period}.json"
+        return self._get_json(("frame", tag, period), url, ttl=CONCEPT_TTL)
+
+    def get_company_sic(self, cik: str, unavailable: Any = None) -> Optional[Dict]:
+        """
+        SIC code + description from the submissions API, e.g. {'sic': '3674', 'sicDescription': ...}.
+        Returns `unavailable` if the page budget ran out with nothing cached.
+        """
+        url = f"{self.data_url}/submissions/CIK{cik}.json"
+        def parse(js):
+            if js is None:
+                return None
+            return {"sic": str(js.get("sic") or ""), "sicDescription": js.get("sicDescription", "")}
+        return self._get_json(("sic", cik), url, ttl=None, tags=[cik_tag(cik)], parse=parse,
+                              unavailable=unavailable)
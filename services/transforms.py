@@ -1,7 +1,7 @@
 # services/transforms.py
 #This file contains functions to transform and analyze financial data fetched from the SEC EDGAR API.
 import pandas as pd
-from typing import Dict, Optional
+from typing import Dict, Optional, Tuple
 from config import COMMON_TAGS
 
 def parse_data(json_data: Dict) -> pd.DataFrame:
@@ -75,3 +75,47 @@ def compute_changes(df: pd.DataFrame, selected_quarter: str):
                         (qoq if label=="qoq" else yoy)[col] = pct
 
     return current, qoq, yoy
+
+def compute_change_matrix(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    QoQ and YoY change for every quarter at once, same rules as compute_changes.
+    Returns one row per quarter: ['Quarter','date','<metric> QoQ','<metric> YoY', ...]
+    """
+    metric_cols = [c for c in ["Revenue","Gross Profit","Net Income","Cash Flow","Gross Margin"] if c in df.columns]
+    out = df[["Quarter","date"]].copy()
+    if out.empty:
+        return out
+    by_quarter = df.set_index("Quarter")[metric_cols]
+    parts = out["Quarter"].str.extract(r"^CY(\d{4})Q([1-4])$").astype(float)
+    year, q = parts[0], parts[1]
+    prev_q = "CY" + (year - (q == 1)).astype("Int64").astype(str) + "Q" + ((q - 2) % 4 + 1).astype("Int64").astype(str)
+    prev_y = "CY" + (year - 1).astype("Int64").astype(str) + "Q" + q.astype("Int64").astype(str)
+
+    for label, ref in [("QoQ", prev_q), ("YoY", prev_y)]:
+        ref_vals = by_quarter.reindex(ref.where(year.notna())).reset_index(drop=True)
+        ref_vals.index = out.index
+        for col in metric_cols:
+            cur, base = df[col], ref_vals[col]
+            out[f"{col} {label}"] = ((cur - base) / base).where(base.notna() & cur.notna() & (base != 0))
+    return out.reset_index(drop=True)
+
+def build_history_table(tables: Dict[Tuple[str, str], pd.DataFrame]) -> pd.DataFrame:
+    """
+    Typed multi-company history: each (company, cik) table joined with its change matrix.
+    Returns ['Company','CIK','Quarter','date',<metrics>...,'<metric> QoQ','<metric> YoY',...]
+    """
+    parts = []
+    for (company, cik), df in tables.items():
+        if df.empty:
+            continue
+        base = df.drop(columns=["frame", "Year"], errors="ignore")
+        changes = compute_change_matrix(df).drop(columns=["date"])
+        part = base.merge(changes, on="Quarter", how="left")
+        part.insert(0, "CIK", cik)
+        part.insert(0, "Company", company)
+        parts.append(part)
+    if not parts:
+        return pd.DataFrame()
+    out = pd.concat(parts, ignore_index=True)
+    lead = ["Company", "CIK", "Quarter", "date"]
+    return out[lead + [c for c in out.columns if c not in lead]]
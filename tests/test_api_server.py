@@ -0,0 +1,117 @@
+# tests/test_api_server.py
+import http.client
+import json
+import os
+import subprocess
+import sys
+import threading
+
+import pytest
+
+import api_server
+from services.sec_api import SECDataFetcher
+from tools.stub_edgar import serve_in_thread
+
+@pytest.fixture(scope="module")
+def api():
+    stub = serve_in_thread(n_companies=10)
+    url = f"http://127.0.0.1:{stub.server_port}"
+    srv = api_server.make_server(port=0, fetcher=SECDataFetcher(www_url=url, data_url=url))
+    threading.Thread(target=srv.serve_forever, daemon=True).start()
+    yield srv.server_port
+    for s in (srv, stub):
+        s.shutdown()
+        s.server_close()
+
+@pytest.fixture
+def slow_api(monkeypatch):
+    """Company list and revenue concept cached from a fast stub; every other request times out."""
+    fast, slow = serve_in_thread(n_companies=10), serve_in_thread(n_companies=10, latency=2.0)
+    fetcher = SECDataFetcher(www_url=f"http://127.0.0.1:{fast.server_port}",
+                             data_url=f"http://127.0.0.1:{fast.server_port}")
+    fetcher.best_revenue_tag("INTEL CORP", "0000001000")
+    fetcher.data_url = f"http://127.0.0.1:{slow.server_port}"
+    monkeypatch.setattr(api_server, "API_BUDGET_S", 0.3)
+    srv = api_server.make_server(port=0, fetcher=fetcher)
+    threading.Thread(target=srv.serve_forever, daemon=True).start()
+    yield srv.server_port
+    for s in (srv, fast, slow):
+        s.shutdown()
+        s.server_close()
+
+def _request(conn, method, path, body=None, headers=None):
+    conn.request(method, path, body=body, headers=headers or {})
+    resp = conn.getresponse()
+    return resp, resp.read()
+
+def test_post_body_does_not_poison_keep_alive(api):
+    conn = http.client.HTTPConnection("127.0.0.1", api)
+    resp, _ = _request(conn, "POST", "/admin/cache/invalidate?cik=1000", body="x" * 20)
+    assert resp.status == 200
+    assert resp.getheader("Cache-Control") == "no-store"
+    resp, _ = _request(conn, "GET", "/health")
+    assert resp.status == 200
+    conn.close()
+
+def test_clear_all_needs_cache_admin(api, monkeypatch):
+    conn = http.client.HTTPConnection("127.0.0.1", api)
+    _request(conn, "GET", "/companies?q=intel")
+    resp, body = _request(conn, "POST", "/admin/cache/invalidate")
+    assert resp.status == 403 and b"CACHE_ADMIN" in body
+    resp, body = _request(conn, "GET", "/health")
+    assert json.loads(body)["cache"]["entries"] > 0
+
+    monkeypatch.setattr(api_server, "CACHE_ADMIN", True)
+    resp, body = _request(conn, "POST", "/admin/cache/invalidate")
+    assert resp.status == 200 and json.loads(body)["invalidated"] > 0
+
+def test_bad_limit_is_400(api):
+    conn = http.client.HTTPConnection("127.0.0.1", api)
+    resp, body = _request(conn, "GET", "/companies?limit=abc")
+    assert resp.status == 400 and b"limit" in body
+    assert resp.getheader("Cache-Control") == "no-store"
+
+def test_cache_control_and_conditional_get(api):
+    conn = http.client.HTTPConnection("127.0.0.1", api)
+    resp, _ = _request(conn, "GET", "/health")
+    assert resp.getheader("Cache-Control") == "no-store"
+    resp, _ = _request(conn, "GET", "/companies/9999/table")
+    assert resp.status == 404 and resp.getheader("Cache-Control") == "no-store"
+
+    resp, body = _request(conn, "GET", "/companies/1000/table?format=csv")
+    assert resp.status == 200 and resp.getheader("Cache-Control").startswith("max-age=")
+    assert body.startswith(b"date,")
+    resp, body = _request(conn, "GET", "/companies/1000/table?format=csv",
+                          headers={"If-None-Match": resp.getheader("ETag")})
+    assert resp.status == 304 and body == b""
+
+def test_gzip_when_accepted(api):
+    conn = http.client.HTTPConnection("127.0.0.1", api)
+    resp, body = _request(conn, "GET", "/companies/1000/changes", headers={"Accept-Encoding": "gzip"})
+    assert resp.status == 200 and resp.getheader("Content-Encoding") == "gzip"
+    assert body[:2] == b"\x1f\x8b"
+
+def test_incomplete_response_is_marked_and_not_cached(slow_api):
+    conn = http.client.HTTPConnection("127.0.0.1", slow_api, timeout=10)
+    for _ in range(2):  # the second request must not be answered from the response cache as fresh
+        resp, body = _request(conn, "GET", "/companies/1000/table?format=csv")
+        assert resp.status == 200
+        assert body.startswith(b"date,Revenue")
+        assert resp.getheader("Cache-Control") == "no-store"
+        assert int(resp.getheader("X-Missing-Requests")) >= 1
+        assert resp.getheader("Warning").startswith("199 ")
+        assert resp.getheader("X-Data-As-Of") is None  # nothing stale was served, data is just missing
+
+def test_summary_text_formats(api):
+    conn = http.client.HTTPConnection("127.0.0.1", api)
+    resp, body = _request(conn, "GET", "/companies/1000/summary?format=txt")
+    assert resp.status == 200 and b"Financial Summary" in body and b"$" in body
+    resp, body = _request(conn, "GET", "/companies/1000/summary?format=csv")
+    assert resp.status == 200 and body.startswith(b"Metric,Current,QoQ Change,YoY Change\n")
+
+def test_api_server_does_not_import_the_ui():
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    code = ("import sys, api_server; "
+            "print(sorted({m.split('.')[0] for m in sys.modules} & {'streamlit', 'xlsxwriter', 'ui'}))")
+    out = subprocess.run([sys.executable, "-c", code], cwd=root, capture_output=True, text=True, check=True)
+    assert out.stdout.strip() == "[]"
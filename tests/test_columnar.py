@@ -0,0 +1,60 @@
+# tests/test_columnar.py
+import io
+
+import pandas as pd
+import pytest
+
+from services.columnar import arrow_available, to_arrow_ipc, to_parquet
+from services.sec_api import SECDataFetcher
+from services.transforms import build_financial_table, build_history_table
+from tools.stub_edgar import REVENUE_TAG, serve_in_thread
+
+pa = pytest.importorskip("pyarrow")
+
+METRICS = ["Revenue", "Gross Profit", "Net Income", "Cash Flow"]
+
+@pytest.fixture(scope="module")
+def history():
+    srv = serve_in_thread(n_companies=10)
+    url = f"http://127.0.0.1:{srv.server_port}"
+    fetcher = SECDataFetcher(www_url=url, data_url=url)
+    try:
+        tables = {(name, cik): build_financial_table(cik, REVENUE_TAG, fetcher)
+                  for name, cik in [("INTEL CORP", "0000001000"), ("NVIDIA CORP", "0000001006")]}
+    finally:
+        srv.shutdown()
+        srv.server_close()
+    tables[("EMPTY CO", "0000009999")] = pd.DataFrame()
+    return build_history_table(tables)
+
+def _check_dtypes(df: pd.DataFrame):
+    assert pd.api.types.is_datetime64_any_dtype(df["date"])
+    for m in METRICS:
+        assert pd.api.types.is_numeric_dtype(df[m]), m
+        assert df[f"{m} QoQ"].dtype == "float64" and df[f"{m} YoY"].dtype == "float64", m
+    assert df["Gross Margin"].dtype == "float64"
+
+def test_build_history_table(history):
+    assert list(history.columns[:4]) == ["Company", "CIK", "Quarter", "date"]
+    assert set(history["Company"]) == {"INTEL CORP", "NVIDIA CORP"}  # empty tables are skipped
+    assert "frame" not in history.columns
+    assert not history.duplicated(subset=["CIK", "Quarter"]).any()
+    _check_dtypes(history)
+
+    intel = history[history["CIK"] == "0000001000"].sort_values("date")
+    prev, last = intel.iloc[-2], intel.iloc[-1]
+    assert last["Revenue QoQ"] == pytest.approx((last["Revenue"] - prev["Revenue"]) / abs(prev["Revenue"]))
+
+def test_build_history_table_empty():
+    assert build_history_table({("EMPTY CO", "0000009999"): pd.DataFrame()}).empty
+
+def test_parquet_round_trip(history):
+    assert arrow_available()
+    back = pd.read_parquet(io.BytesIO(to_parquet(history)))
+    _check_dtypes(back)
+    pd.testing.assert_frame_equal(back, history, check_dtype=False)
+
+def test_arrow_ipc_round_trip(history):
+    back = pa.ipc.open_stream(to_arrow_ipc(history)).read_pandas()
+    _check_dtypes(back)
+    pd.testing.assert_frame_equal(back, history, check_dtype=False)
@@ -0,0 +1,143 @@
+# tests/test_fsds.py
+import sqlite3
+import zipfile
+
+import pandas as pd
+import pytest
+
+from services.fsds import ingest_zip, lookup_segments, period_label, parse_segments, _single_axis
+
+CIK = "0001045810"
+SUB = (
+    "adsh\tcik\tname\tform\tperiod\n"
+    "0001\t1045810\tNVIDIA CORP\t10-Q\t20240430\n"
+    "0002\t1045810\tNVIDIA CORP\t10-K\t20240131\n"
+    "0003\t99\tSOME SPAC\tS-1\t20240331\n"
+)
+NUM_HEADER = "adsh\ttag\tversion\tddate\tqtrs\tuom\tsegments\tcoreg\tvalue\tfootnote\n"
+NUM_ROWS = [
+    # 52/53-week quarter ending late April → CY2024Q1
+    ("0001", "Revenues", "20240430", "1", "USD", "BusinessSegments=ComputeAndNetworking;", "", "22675000000"),
+    ("0001", "Revenues", "20240430", "1", "USD", "BusinessSegments=Graphics;", "", "3369000000"),
+    # prior-year comparative in the same filing → CY2023Q1
+    ("0001", "Revenues", "20230430", "1", "USD", "BusinessSegments=Graphics;", "", "2000000000"),
+    # product axis, fewer members than business segments
+    ("0001", "Revenues", "20240430", "1", "USD", "ProductOrService=DataCenter;", "", "22563000000"),
+    # filtered out: no segment, non-USD, year-to-date, two dimensions, co-registrant
+    ("0001", "Revenues", "20240430", "1", "USD", "", "", "26044000000"),
+    ("0001", "Revenues", "20240430", "1", "EUR", "BusinessSegments=Graphics;", "", "3100000000"),
+    ("0001", "Revenues", "20240430", "4", "USD", "BusinessSegments=Graphics;", "", "9999"),
+    ("0001", "Revenues", "20240430", "1", "USD", "BusinessSegments=Graphics;ProductOrService=Gaming;", "", "1"),
+    ("0001", "Revenues", "20240430", "1", "USD", "BusinessSegments=Graphics;", "SubCo", "7"),
+    # 53-week fiscal Q4 ending late January → CY2023Q4
+    ("0002", "Revenues", "20240128", "1", "USD", "BusinessSegments=Graphics;", "", "2900000000"),
+    # not a 10-Q/10-K
+    ("0003", "Revenues", "20240331", "1", "USD", "BusinessSegments=A;", "", "5"),
+    # not a revenue tag
+    ("0001", "NetIncomeLoss", "20240430", "1", "USD", "BusinessSegments=Graphics;", "", "123"),
+]
+
+def _write_zip(path, rows=NUM_ROWS, header=NUM_HEADER):
+    body = "".join("\t".join((a, tag, "us-gaap/2023", d, q, uom, seg, coreg, val, "")) + "\n"
+                   for a, tag, d, q, uom, seg, coreg, val in rows)
+    with zipfile.ZipFile(path, "w") as zf:
+        zf.writestr("sub.txt", SUB)
+        zf.writestr("num.txt", header + body)
+    return str(path)
+
+@pytest.fixture
+def index(tmp_path):
+    path = str(tmp_path / "idx.sqlite")
+    ingest_zip(_write_zip(tmp_path / "2024q2.zip"), path, chunksize=2)
+    return path
+
+def _facts(index_path):
+    con = sqlite3.connect(index_path)
+    try:
+        return pd.read_sql_query("SELECT * FROM segment_facts", con)
+    finally:
+        con.close()
+
+def test_period_label_maps_52_53_week_quarters():
+    labels = period_label(pd.Series(["20240430", "20240128", "20240331", "20231231", "20240630"]))
+    assert labels.tolist() == ["CY2024Q1", "CY2023Q4", "CY2024Q1", "CY2023Q4", "CY2024Q2"]
+
+def test_parse_segments():
+    assert parse_segments("BusinessSegments=Graphics;") == [("BusinessSegments", "Graphics")]
+    assert parse_segments("A=x;B=y;") == [("A", "x"), ("B", "y")]
+    assert parse_segments("") == []
+
+def test_ingest_filters_in_small_chunks(tmp_path):
+    path = str(tmp_path / "idx.sqlite")
+    written = ingest_zip(_write_zip(tmp_path / "2024q2.zip"), path, chunksize=2)
+    facts = _facts(path)
+    # 5 single-axis facts + 1 two-dimension fact; everything else is filtered
+    assert written == 6 and len(facts) == 6
+    assert set(facts["cik"]) == {CIK}
+    assert set(facts["tag"]) == {"Revenues"}
+    assert not facts["segments"].eq("").any()
+    assert 3100000000 not in facts["value"].tolist()  # EUR
+    assert 7 not in facts["value"].tolist()           # co-registrant
+    assert 9999 not in facts["value"].tolist()        # qtrs=4
+    assert set(facts["period"]) == {"CY2024Q1", "CY2023Q1", "CY2023Q4"}
+
+def test_chunksize_does_not_change_result(tmp_path):
+    small, large = str(tmp_path / "a.sqlite"), str(tmp_path / "b.sqlite")
+    zip_path = _write_zip(tmp_path / "2024q2.zip")
+    ingest_zip(zip_path, small, chunksize=1)
+    ingest_zip(zip_path, large, chunksize=10_000)
+    cols = ["cik", "period", "tag", "segments", "value"]
+    assert _facts(small)[cols].sort_values(cols).values.tolist() == _facts(large)[cols].sort_values(cols).values.tolist()
+
+def test_reingest_is_skipped_unless_forced(tmp_path, index):
+    zip_path = _write_zip(tmp_path / "2024q2.zip")
+    assert ingest_zip(zip_path, index, chunksize=2) == 0
+    assert ingest_zip(zip_path, index, chunksize=2, force=True) == 6
+    assert len(_facts(index)) == 6  # INSERT OR REPLACE: no duplicates
+
+def test_ingest_requires_segments_column(tmp_path):
+    header = NUM_HEADER.replace("\tsegments", "")
+    rows = [r[:5] + r[6:] for r in NUM_ROWS]
+    body = "".join("\t".join((a, tag, "v", d, q, uom, coreg, val, "")) + "\n" for a, tag, d, q, uom, coreg, val in rows)
+    zip_path = tmp_path / "2023q1.zip"
+    with zipfile.ZipFile(zip_path, "w") as zf:
+        zf.writestr("sub.txt", SUB)
+        zf.writestr("num.txt", header + body)
+    with pytest.raises(ValueError, match="segments"):
+        ingest_zip(str(zip_path), str(tmp_path / "idx.sqlite"))
+
+def test_single_axis_prefers_business_segments():
+    facts = pd.DataFrame({
+        "tag": ["Revenues"] * 4,
+        "segments": ["ProductOrService=DataCenter;", "ProductOrService=Gaming;", "ProductOrService=Auto;",
+                     "BusinessSegments=Graphics;"],
+        "value": [1.0, 2.0, 3.0, 4.0],
+    })
+    picked = _single_axis(facts)
+    assert picked["Axis"].unique().tolist() == ["BusinessSegments"]
+
+def test_single_axis_falls_back_to_largest_axis_and_preferred_tag():
+    facts = pd.DataFrame({
+        "tag": ["Revenues", "Revenues", "Revenues", "RevenueFromContractWithCustomerExcludingAssessedTax"],
+        "segments": ["Geo=US;", "Geo=EU;", "Product=A;", "Product=B;"],
+        "value": [1.0, 2.0, 3.0, 4.0],
+    })
+    # The preferred tag wins first, leaving only its axis
+    assert _single_axis(facts)["Segment"].tolist() == ["B"]
+    assert _single_axis(facts[facts["tag"] == "Revenues"])["Axis"].unique().tolist() == ["Geo"]
+
+def test_lookup_segments_values(index):
+    out = lookup_segments(CIK, "CY2024Q1", index)
+    assert out["Segment"].tolist() == ["ComputeAndNetworking", "Graphics"]
+    graphics = out.set_index("Segment").loc["Graphics"]
+    assert graphics["Revenue"] == 3369000000
+    assert graphics["Share"] == pytest.approx(3369 / (22675 + 3369))
+    assert graphics["QoQ Change"] == pytest.approx(3369 / 2900 - 1)
+    assert graphics["YoY Change"] == pytest.approx(3369 / 2000 - 1)
+    assert out["Share"].sum() == pytest.approx(1.0)
+    assert pd.isna(out.set_index("Segment").loc["ComputeAndNetworking", "QoQ Change"])
+
+def test_lookup_segments_empty_cases(index, tmp_path):
+    assert lookup_segments(CIK, "CY2020Q1", index).empty
+    assert lookup_segments("0000000001", "CY2024Q1", index).empty
+    assert lookup_segments(CIK, "CY2024Q1", str(tmp_path / "missing.sqlite")).empty
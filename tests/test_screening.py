@@ -0,0 +1,78 @@
+# tests/test_screening.py
+import pandas as pd
+import pytest
+
+from services.screening import build_screen, filter_by_sic, peer_rank, rank_table
+from services.sec_api import SECDataFetcher
+from tools.stub_edgar import serve_in_thread
+
+PERIOD = "CY2023Q4"
+
+@pytest.fixture(scope="module")
+def stub_url():
+    srv = serve_in_thread(n_companies=25)
+    yield f"http://127.0.0.1:{srv.server_port}"
+    srv.shutdown()
+    srv.server_close()
+
+@pytest.fixture
+def fetcher(stub_url):
+    return SECDataFetcher(www_url=stub_url, data_url=stub_url)
+
+@pytest.fixture
+def screen(fetcher):
+    return build_screen(fetcher, PERIOD, "Revenue")
+
+def test_build_screen(screen):
+    assert len(screen) == 25
+    assert list(screen.columns[:4]) == ["CIK", "Company", "Ticker", "Revenue"]
+    assert screen["Revenue"].is_monotonic_decreasing
+    assert screen["Ticker"].str.startswith("STB").all()
+    for col in ["QoQ Growth", "YoY Growth", "Gross Margin"]:
+        assert screen[col].notna().all()
+    assert screen["Gross Margin"].between(0, 1).all()
+    assert screen["Revenue Pctl"].max() == 1.0
+
+def test_build_screen_empty_period(fetcher):
+    assert build_screen(fetcher, "CY2010Q1", "Revenue").empty
+
+def test_filter_by_sic(screen, fetcher):
+    out, unchecked, unresolved = filter_by_sic(screen, fetcher, "367", max_lookups=len(screen))
+    assert (unchecked, unresolved) == (0, 0)
+    # SIC codes cycle through 5 values in the stub; 3674 and 3678 share the '367' prefix
+    assert len(out) == 10
+    assert out["SIC"].str.startswith("367").all()
+    assert out["Revenue Pctl"].max() == 1.0  # re-ranked within the sector
+
+def test_filter_by_sic_counts_unchecked(screen, fetcher):
+    out, unchecked, unresolved = filter_by_sic(screen, fetcher, "367", max_lookups=5)
+    assert unchecked == 20
+    assert unresolved == 0
+    assert len(out) <= 5
+
+def test_filter_by_sic_counts_unresolved_lookups(screen, fetcher):
+    slow = serve_in_thread(n_companies=25, latency=2.0)
+    try:
+        fetcher.data_url = f"http://127.0.0.1:{slow.server_port}"
+        with fetcher.page_budget(0.2) as page:
+            out, unchecked, unresolved = filter_by_sic(screen, fetcher, "367", max_lookups=len(screen))
+    finally:
+        slow.shutdown()
+        slow.server_close()
+    assert page.degraded
+    assert unchecked == 0
+    assert unresolved == len(screen)
+    assert out.empty
+
+def test_rank_table_drops_missing_and_numbers_rows():
+    df = pd.DataFrame({"CIK": ["a", "b", "c"], "YoY Growth": [0.1, None, 0.3]})
+    ranked = rank_table(df, "YoY Growth")
+    assert ranked["CIK"].tolist() == ["c", "a"]
+    assert ranked["Rank"].tolist() == [1, 2]
+    assert rank_table(df, "YoY Growth", ascending=True)["CIK"].tolist() == ["a", "c"]
+
+def test_peer_rank(screen):
+    top = screen.iloc[0]["CIK"]
+    assert peer_rank(screen, top, "Revenue") == (1, len(screen))
+    assert peer_rank(screen, screen.iloc[-1]["CIK"], "Revenue") == (len(screen), len(screen))
+    assert peer_rank(screen, "9999999999", "Revenue") is None
@@ -0,0 +1,150 @@
+# tests/test_sec_api.py
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+import services.sec_api as sec_api
+from services.sec_api import SECDataFetcher, _LatencyTracker
+from tools.stub_edgar import REVENUE_TAG, serve_in_thread
+
+CIK = "0000001000"
+
+@pytest.fixture
+def stub():
+    servers = []
+    def start(**kwargs):
+        srv = serve_in_thread(n_companies=10, **kwargs)
+        servers.append(srv)
+        return f"http://127.0.0.1:{srv.server_port}"
+    yield start
+    for srv in servers:
+        srv.shutdown()
+        srv.server_close()
+
+@pytest.fixture
+def fast_hedge(monkeypatch):
+    monkeypatch.setattr(sec_api, "HEDGE_DEFAULT_DELAY_S", 0.05)
+
+def _fetcher(url):
+    return SECDataFetcher(www_url=url, data_url=url)
+
+def test_hedge_is_sent_for_slow_requests(stub, fast_hedge):
+    f = _fetcher(stub(latency=0.2, jitter=0.2))
+    with f.page_budget(5) as page:
+        js = f.fetch_concept(CIK, REVENUE_TAG)
+    assert js["tag"] == REVENUE_TAG
+    assert f.hedges == 1
+    assert not page.degraded
+
+def test_no_hedge_for_fast_requests(stub):
+    f = _fetcher(stub())
+    with f.page_budget(5):
+        assert f.fetch_concept(CIK, REVENUE_TAG) is not None
+    assert f.hedges == 0
+
+def test_queue_time_does_not_trigger_hedge(stub, fast_hedge):
+    f = _fetcher(stub())
+    f._pool = ThreadPoolExecutor(max_workers=1)
+    f._pool.submit(time.sleep, 0.3)  # the request waits for the only worker well past the hedge delay
+    with f.page_budget(5):
+        assert f.fetch_concept(CIK, REVENUE_TAG) is not None
+    assert f.hedges == 0
+
+def test_hedges_in_flight_are_capped(stub, fast_hedge, monkeypatch):
+    monkeypatch.setattr(sec_api, "HEDGE_MAX_IN_FLIGHT", 1)
+    f = _fetcher(stub(latency=0.3))
+    def load(tag):
+        with f.page_budget(5):
+            return f.fetch_concept(CIK, tag)
+    with ThreadPoolExecutor(max_workers=3) as pool:
+        results = list(pool.map(load, [REVENUE_TAG, "GrossProfit", "NetIncomeLoss"]))
+    assert all(js is not None for js in results)
+    assert f.hedges == 1
+
+def test_request_still_queued_at_deadline_is_not_sent(stub, monkeypatch):
+    f = _fetcher(stub())
+    f._pool = ThreadPoolExecutor(max_workers=1)
+    blocker = f._pool.submit(time.sleep, 0.4)
+    sent = []
+    real_get = sec_api.requests.get
+    monkeypatch.setattr(sec_api.requests, "get", lambda url, **kw: sent.append(url) or real_get(url, **kw))
+    with f.page_budget(0.1) as page:
+        assert f.fetch_concept(CIK, REVENUE_TAG) is None
+    assert page.missing == 1
+    blocker.result()
+    f._pool.shutdown(wait=True)
+    assert sent == []
+
+def test_stale_copy_served_when_budget_runs_out(stub, monkeypatch):
+    fast, slow = stub(), stub(latency=2.0)
+    f = _fetcher(fast)
+    fresh = f.fetch_concept(CIK, REVENUE_TAG)
+    fetched_before = time.time()
+
+    monkeypatch.setattr(sec_api, "CONCEPT_TTL", 0)  # everything cached is now expired
+    f.data_url = slow
+    t0 = time.monotonic()
+    with f.page_budget(0.3) as page:
+        served = f.fetch_concept(CIK, REVENUE_TAG)
+        missing = f.fetch_concept(CIK, "GrossProfit")
+    assert time.monotonic() - t0 < 1.0
+    assert served == fresh
+    assert missing is None
+    assert page.degraded
+    assert page.missing == 1
+    assert page.oldest is not None and page.oldest <= fetched_before
+
+def test_resume_spends_the_same_page_budget(stub):
+    f = _fetcher(stub(latency=2.0))
+    with f.page_budget(0.1) as page:
+        pass
+    time.sleep(0.15)
+    t0 = time.monotonic()
+    with f.resume(page):
+        assert f.fetch_concept(CIK, REVENUE_TAG) is None
+    assert time.monotonic() - t0 < 0.1
+    assert page.missing == 1
+
+def test_best_revenue_tag_unknown_when_budget_exhausted(stub):
+    f = _fetcher(stub(latency=2.0))
+    with f.page_budget(0.2) as page:
+        assert f.best_revenue_tag("INTEL CORP", CIK) is None
+        assert f.test_tag_availability(CIK, REVENUE_TAG) is None
+    assert page.missing >= 1
+
+def test_best_revenue_tag_within_budget(stub):
+    f = _fetcher(stub())
+    with f.page_budget(5):
+        assert f.best_revenue_tag("INTEL CORP", CIK) == REVENUE_TAG
+        assert f.test_tag_availability(CIK, "SalesRevenueNet") is False
+
+def test_server_errors_outside_budget_return_none_uncached():
+    class Failing(BaseHTTPRequestHandler):
+        def do_GET(self):
+            self.send_error(503)
+        def log_message(self, *args):
+            pass
+    srv = ThreadingHTTPServer(("127.0.0.1", 0), Failing)
+    threading.Thread(target=srv.serve_forever, daemon=True).start()
+    try:
+        f = _fetcher(f"http://127.0.0.1:{srv.server_port}")
+        assert f.fetch_concept(CIK, REVENUE_TAG) is None
+        assert f.fetch_frame("Revenues", "CY2024Q1") is None
+        assert f.cache.stats()["entries"] == 0
+    finally:
+        srv.shutdown()
+        srv.server_close()
+
+def test_hedge_delay_uses_percentile_within_bounds(monkeypatch):
+    monkeypatch.setattr(sec_api, "HEDGE_DELAY_BOUNDS_S", (0.05, 2.0))
+    t = _LatencyTracker(min_samples=20)
+    assert t.hedge_delay() == sec_api.HEDGE_DEFAULT_DELAY_S
+    for i in range(100):
+        t.record(i / 100)
+    assert t.hedge_delay() == pytest.approx(0.95)
+    for _ in range(200):
+        t.record(10.0)
+    assert t.hedge_delay() == 2.0
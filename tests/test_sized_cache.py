@@ -0,0 +1,92 @@
+# tests/test_sized_cache.py
+import time
+
+import pandas as pd
+import pytest
+
+from utils.sized_cache import SizeAwareCache, estimate_size
+
+def test_estimate_size_is_deep():
+    df = pd.DataFrame({"a": range(1000), "b": ["x" * 20] * 1000})
+    assert estimate_size(df) == int(df.memory_usage(deep=True, index=True).sum())
+    assert estimate_size({"k": b"x" * 10_000}) > 10_000
+    assert estimate_size([b"x" * 5000, b"x" * 5000]) > 10_000
+
+def test_byte_accounting_on_set_replace_and_invalidate():
+    c = SizeAwareCache(10_000)
+    c.set("a", None, nbytes=1000)
+    c.set("b", None, nbytes=2000)
+    assert c.stats()["bytes"] == 3000
+    c.set("a", None, nbytes=500)  # replace
+    assert c.stats()["bytes"] == 2500
+    assert c.invalidate("b")
+    assert not c.invalidate("b")
+    assert c.stats()["bytes"] == 500
+    c.clear()
+    assert c.stats()["bytes"] == 0 and c.stats()["entries"] == 0
+
+def test_oversize_entry_is_rejected():
+    c = SizeAwareCache(1000)
+    assert not c.set("big", None, nbytes=1001)
+    assert c.get("big", "miss") == "miss"
+    assert c.stats()["rejections"] == 1
+
+def test_lru_evicts_least_recently_used():
+    c = SizeAwareCache(3000, "lru")
+    c.set("a", 1, nbytes=1000)
+    c.set("b", 2, nbytes=1000)
+    c.set("c", 3, nbytes=1000)
+    c.get("a")
+    assert c.set("d", 4, nbytes=1000)
+    assert c.get("b") is None
+    assert [c.get(k) for k in "acd"] == [1, 3, 4]
+    assert c.stats()["evictions"] == 1
+
+def test_lfu_evicts_least_frequently_used_but_never_the_new_entry():
+    c = SizeAwareCache(3000, "lfu")
+    for k in "abc":
+        c.set(k, k, nbytes=1000)
+    for k in "ab":
+        c.get(k)
+    c.get("c")
+    c.get("a")
+    assert c.set("d", "d", nbytes=1000)  # every other entry has hits > 0
+    assert c.get("d") == "d"
+    assert c.get("b") is None and c.get("c") == "c"  # b: fewest hits, least recently used
+    assert c.stats()["bytes"] <= 3000
+
+def test_ttl_expiry_counts_as_miss():
+    c = SizeAwareCache(10_000)
+    c.set("k", "v", ttl=0.05)
+    assert c.get("k") == "v"
+    time.sleep(0.08)
+    assert c.get("k") is None
+    s = c.stats()
+    assert s["expirations"] == 1 and s["entries"] == 0 and s["bytes"] == 0
+
+def test_invalidate_tag_and_stats():
+    c = SizeAwareCache(10_000)
+    c.set(("concept", "1", "Revenues"), 1, tags=["cik:1"], nbytes=10)
+    c.set(("concept", "1", "NetIncomeLoss"), 2, tags=["cik:1"], nbytes=10)
+    c.set(("concept", "2", "Revenues"), 3, tags=["cik:2"], nbytes=10)
+    assert c.invalidate_tag("cik:1") == 2
+    assert c.get(("concept", "2", "Revenues")) == 3
+    assert c.get(("concept", "1", "Revenues")) is None
+    s = c.stats()
+    assert (s["hits"], s["misses"], s["entries"]) == (1, 1, 1)
+    assert s["hit_rate"] == pytest.approx(0.5)
+    assert [e["kind"] for e in c.entries()] == ["concept"]
+
+def test_get_or_compute_caches_none():
+    c = SizeAwareCache(10_000)
+    calls = []
+    def compute():
+        calls.append(1)
+        return None
+    assert c.get_or_compute("k", compute) is None
+    assert c.get_or_compute("k", compute) is None
+    assert len(calls) == 1
+
+def test_unknown_policy():
+    with pytest.raises(ValueError):
+        SizeAwareCache(10, "fifo")
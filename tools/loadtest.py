@@ -0,0 +1,253 @@
+# tools/loadtest.py
+#Concurrent-session load test: starts `streamlit run app.py` against a stub EDGAR server with
+#configurable latency, then drives N simulated analysts over the same websocket protocol the
+#browser uses. CPU, RSS and errors are read from the Streamlit server process.
+#
+#   python -m tools.loadtest --sessions 1,5,10,20 --iterations 3 --latency 0.1 --jitter 0.2
+import argparse
+import os
+import random
+import socket
+import statistics
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+import requests
+from websockets.sync.client import connect
+
+from streamlit.proto.BackMsg_pb2 import BackMsg
+from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+from streamlit.proto.WidgetStates_pb2 import WidgetState
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+APP = os.path.join(ROOT, "app.py")
+_EARLY_FOR_RERUN = ForwardMsg.ScriptFinishedStatus.FINISHED_EARLY_FOR_RERUN
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+def _wait_for_port(port: int, what: str, timeout: float = 60.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=0.5).close()
+            return
+        except OSError:
+            time.sleep(0.1)
+    raise RuntimeError(f"{what} did not start on port {port}")
+
+def _proc_usage(pid: int) -> Tuple[float, float]:
+    """(CPU seconds, RSS bytes) of another process; NaN where /proc is unavailable (macOS)."""
+    try:
+        with open(f"/proc/{pid}/stat") as f:
+            fields = f.read().rsplit(")", 1)[1].split()
+        with open(f"/proc/{pid}/statm") as f:
+            rss = int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except OSError:
+        return float("nan"), float("nan")
+    # utime/stime are fields 14/15 of stat, counted after the ')' closing the process name
+    return (int(fields[11]) + int(fields[12])) / os.sysconf("SC_CLK_TCK"), rss
+
+def _percentile(values: List[float], pct: float) -> float:
+    if not values:
+        return float("nan")
+    ordered = sorted(values)
+    k = (len(ordered) - 1) * pct / 100
+    lo, hi = int(k), min(int(k) + 1, len(ordered) - 1)
+    return ordered[lo] + (ordered[hi] - ordered[lo]) * (k - lo)
+
+class BrowserSession:
+    """
+    One browser tab: a websocket to /_stcore/stream that sends rerun requests carrying widget
+    values and reads ForwardMsgs until the script run finishes, like the Streamlit frontend.
+    """
+
+    def __init__(self, ws, base_url: str, timeout: float):
+        self.ws = ws
+        self.base_url = base_url
+        self.timeout = timeout
+        self.states: Dict[str, WidgetState] = {}
+        self.widgets: Dict[str, List] = {}  # element type -> protos from the last run
+
+    def run(self, action: str, log: List[Tuple[str, float]], trigger: Optional[WidgetState] = None):
+        """Rerun with the current widget values (plus a one-off button trigger) and wait for it to finish."""
+        msg = BackMsg()
+        msg.rerun_script.query_string = ""
+        live = {w.id for protos in self.widgets.values() for w in protos}
+        msg.rerun_script.widget_states.widgets.extend(s for wid, s in self.states.items() if wid in live)
+        if trigger is not None:
+            msg.rerun_script.widget_states.widgets.append(trigger)
+
+        t0 = time.perf_counter()
+        self.ws.send(msg.SerializeToString())
+        widgets: Dict[str, List] = {}
+        errors: List[str] = []
+        while True:
+            fwd = ForwardMsg()
+            fwd.ParseFromString(self.ws.recv(timeout=self.timeout))
+            if fwd.HasField("delta") and fwd.delta.HasField("new_element"):
+                el = fwd.delta.new_element
+                kind = el.WhichOneof("type")
+                if kind == "exception":
+                    errors.append(f"{el.exception.type}: {el.exception.message}")
+                elif kind in ("selectbox", "slider", "download_button"):
+                    widgets.setdefault(kind, []).append(getattr(el, kind))
+            elif fwd.HasField("script_finished"):
+                if fwd.script_finished == _EARLY_FOR_RERUN:  # st.rerun(): a new run follows
+                    widgets, errors = {}, []
+                    continue
+                break
+        log.append((action, time.perf_counter() - t0))
+        self.widgets = widgets
+        if errors:
+            raise RuntimeError(f"{action}: {errors[0]}")
+
+    def select(self, key: str = None, label: str = None, choose=random.choice) -> bool:
+        """Pick an option in a selectbox found by key suffix or label; False if it isn't on the page."""
+        box = next((s for s in self.widgets.get("selectbox", [])
+                    if (key and s.id.endswith(f"-{key}")) or (label and s.label == label)), None)
+        if box is None or not box.options:
+            return False
+        self.states[box.id] = WidgetState(id=box.id, string_value=choose(list(box.options)))
+        return True
+
+    def download(self, log: List[Tuple[str, float]]) -> bool:
+        """Click the first download button: rerun (unless the button opts out), then fetch the file."""
+        buttons = self.widgets.get("download_button", [])
+        if not buttons:
+            return False
+        button = buttons[0]
+        t0 = time.perf_counter()
+        if not button.ignore_rerun:
+            self.run("download", log, trigger=WidgetState(id=button.id, trigger_value=True))
+            button = next((b for b in self.widgets.get("download_button", []) if b.id == button.id), button)
+        if button.url:
+            requests.get(f"{self.base_url}{button.url}", timeout=self.timeout).raise_for_status()
+        if button.ignore_rerun:
+            log.append(("download", time.perf_counter() - t0))
+        return True
+
+def run_session(base_url: str, seed: int, iterations: int, timeout: float) -> List[Tuple[str, float]]:
+    """One analyst: open app, then repeatedly pick a company, change quarter, move sliders, download."""
+    from config import DEFAULT_COMPANIES
+
+    rng = random.Random(seed)
+    log: List[Tuple[str, float]] = []
+    with connect(f"ws{base_url[4:]}/_stcore/stream", subprotocols=["streamlit"],
+                 max_size=None, open_timeout=timeout) as ws:
+        session = BrowserSession(ws, base_url, timeout)
+        session.run("open", log)
+        for _ in range(iterations):
+            if session.select(key="quick_select", choose=lambda opts: rng.choice(
+                    [o for o in opts if o in DEFAULT_COMPANIES] or opts)):
+                session.run("company", log)
+
+            if session.select(label="Select Quarter", choose=rng.choice):
+                session.run("quarter", log)
+
+            sliders = session.widgets.get("slider", [])
+            if sliders:
+                slider = sliders[0]
+                lo, hi = int(slider.min), int(slider.max)
+                start = rng.randint(lo, hi)
+                state = WidgetState(id=slider.id)
+                state.double_array_value.data[:] = [start, rng.randint(start, hi)]
+                session.states[slider.id] = state
+                session.run("slider", log)
+
+            session.download(log)
+    return log
+
+def _start_app(stub_url: str) -> Tuple[subprocess.Popen, str]:
+    port = _free_port()
+    env = dict(os.environ, SEC_WWW_URL=stub_url, SEC_DATA_URL=stub_url)
+    app = subprocess.Popen(
+        [sys.executable, "-m", "streamlit", "run", APP, "--server.headless", "true",
+         "--server.port", str(port), "--server.fileWatcherType", "none",
+         "--browser.gatherUsageStats", "false", "--logger.level", "error"],
+        cwd=ROOT, env=env, stdout=subprocess.DEVNULL)
+    _wait_for_port(port, "Streamlit")
+    return app, f"http://127.0.0.1:{port}"
+
+def run_level(stub_url: str, sessions: int, iterations: int, timeout: float) -> Dict:
+    """A fresh server per level, so caches and RSS don't carry over from the previous level."""
+    app, base_url = _start_app(stub_url)
+    try:
+        # One throwaway session so the RSS delta excludes importing streamlit/pandas/the app
+        run_session(base_url, seed=-1, iterations=0, timeout=timeout)
+        cpu0, rss0 = _proc_usage(app.pid)
+        t0 = time.perf_counter()
+        errors = 0
+        logs: List[Tuple[str, float]] = []
+        with ThreadPoolExecutor(max_workers=sessions) as pool:
+            futures = [pool.submit(run_session, base_url, seed, iterations, timeout) for seed in range(sessions)]
+            for f in futures:
+                try:
+                    logs += f.result()
+                except Exception as e:
+                    errors += 1
+                    print(f"  session failed: {e}", file=sys.stderr)
+        wall = time.perf_counter() - t0
+        cpu, rss = _proc_usage(app.pid)
+    finally:
+        app.terminate()
+        app.wait()
+
+    lat = [d for _, d in logs]
+    by_action = {a: statistics.median([d for b, d in logs if b == a]) for a in sorted({a for a, _ in logs})}
+    return {
+        "sessions": sessions, "reruns": len(lat), "errors": errors, "wall_s": wall,
+        "p50": _percentile(lat, 50), "p95": _percentile(lat, 95), "p99": _percentile(lat, 99),
+        "throughput": len(lat) / wall if wall else 0.0,
+        "cpu_per_session_s": (cpu - cpu0) / sessions,
+        "rss_mb": rss / 2**20,
+        "rss_delta_per_session_mb": (rss - rss0) / 2**20 / sessions,
+        "median_by_action": by_action,
+    }
+
+def _print_report(rows: List[Dict]):
+    print(f"{'sessions':>8} {'reruns':>7} {'err':>4} {'p50 s':>7} {'p95 s':>7} {'p99 s':>7} "
+          f"{'rerun/s':>8} {'cpu s/sess':>10} {'rss MB':>8} {'ΔMB/sess':>9}")
+    for r in rows:
+        print(f"{r['sessions']:>8} {r['reruns']:>7} {r['errors']:>4} {r['p50']:>7.3f} {r['p95']:>7.3f} "
+              f"{r['p99']:>7.3f} {r['throughput']:>8.2f} {r['cpu_per_session_s']:>10.2f} "
+              f"{r['rss_mb']:>8.1f} {r['rss_delta_per_session_mb']:>9.2f}")
+    for r in rows:
+        parts = ", ".join(f"{a} {d:.3f}s" for a, d in r["median_by_action"].items())
+        print(f"  {r['sessions']} sessions, median per action: {parts}")
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Concurrent-session load test for app.py")
+    ap.add_argument("--sessions", default="1,5,10", help="Comma-separated concurrency levels")
+    ap.add_argument("--iterations", type=int, default=3, help="Action cycles per session")
+    ap.add_argument("--latency", type=float, default=0.05, help="Stub EDGAR fixed latency (s)")
+    ap.add_argument("--jitter", type=float, default=0.1, help="Stub EDGAR random extra latency (s)")
+    ap.add_argument("--companies", type=int, default=200, help="Companies in the stub universe")
+    ap.add_argument("--timeout", type=float, default=120.0, help="Per-rerun timeout (s)")
+    args = ap.parse_args(argv)
+
+    port = _free_port()
+    stub_url = f"http://127.0.0.1:{port}"
+    sys.path.insert(0, ROOT)
+    stub = subprocess.Popen(
+        [sys.executable, "-m", "tools.stub_edgar", "--port", str(port), "--companies", str(args.companies),
+         "--latency", str(args.latency), "--jitter", str(args.jitter)],
+        cwd=ROOT, stdout=subprocess.DEVNULL)
+    try:
+        _wait_for_port(port, "Stub EDGAR")
+        rows = []
+        for n in [int(x) for x in args.sessions.split(",") if x.strip()]:
+            print(f"Running {n} concurrent session(s)...", file=sys.stderr)
+            rows.append(run_level(stub_url, n, args.iterations, args.timeout))
+        _print_report(rows)
+    finally:
+        stub.terminate()
+        stub.wait()
+
+if __name__ == "__main__":
+    main()
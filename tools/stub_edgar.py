@@ -0,0 +1,142 @@
+# tools/stub_edgar.py
+#Local stand-in for the EDGAR endpoints the app uses, serving deterministic synthetic filings.
+#
+#   python -m tools.stub_edgar --port 8765 --companies 500 --latency 0.2 --jitter 0.3
+#   SEC_WWW_URL=http://127.0.0.1:8765 SEC_DATA_URL=http://127.0.0.1:8765 streamlit run app.py
+import argparse
+import json
+import random
+import re
+import threading
+import time
+from datetime import date, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional
+from config import DEFAULT_COMPANIES, COMMON_TAGS
+
+REVENUE_TAG = "RevenueFromContractWithCustomerExcludingAssessedTax"
+FIRST_YEAR, LAST_YEAR = 2018, date.today().year
+SIC_CODES = [("3674", "SEMICONDUCTORS & RELATED DEVICES"),
+             ("3576", "COMPUTER COMMUNICATIONS EQUIPMENT"),
+             ("3678", "ELECTRONIC CONNECTORS"),
+             ("7372", "SERVICES-PREPACKAGED SOFTWARE"),
+             ("2834", "PHARMACEUTICAL PREPARATIONS")]
+
+def _quarter_end(year: int, q: int) -> date:
+    return date(year + (q == 4), (q * 3) % 12 + 1, 1) - timedelta(days=1)
+
+class StubData:
+    """Synthetic universe: DEFAULT_COMPANIES plus generated filers, each with quarterly history."""
+
+    def __init__(self, n_companies: int = 200, seed: int = 7):
+        names = list(DEFAULT_COMPANIES) + [f"STUB COMPANY {i:04d} INC" for i in range(max(0, n_companies - len(DEFAULT_COMPANIES)))]
+        self.companies: List[Dict] = []
+        self.facts: Dict[str, Dict[str, Dict[str, float]]] = {}  # cik -> tag -> frame -> val
+        for i, name in enumerate(names):
+            rng = random.Random(seed * 100003 + i)
+            cik = str(1000 + i).zfill(10)
+            sic = SIC_CODES[i % len(SIC_CODES)]
+            self.companies.append({"cik": cik, "name": name, "ticker": f"STB{i}", "sic": sic})
+            rev = rng.uniform(1e8, 2e10)
+            margin = rng.uniform(0.2, 0.7)
+            series: Dict[str, Dict[str, float]] = {REVENUE_TAG: {}, **{t: {} for t in COMMON_TAGS.values()}}
+            for year in range(FIRST_YEAR, LAST_YEAR + 1):
+                for q in range(1, 5):
+                    if _quarter_end(year, q) > date.today():
+                        break
+                    rev *= rng.uniform(0.93, 1.09)
+                    frame = f"CY{year}Q{q}"
+                    series[REVENUE_TAG][frame] = round(rev)
+                    series["GrossProfit"][frame] = round(rev * min(0.9, max(0.05, margin + rng.uniform(-0.03, 0.03))))
+                    series["NetIncomeLoss"][frame] = round(rev * rng.uniform(-0.05, 0.25))
+                    series["NetCashProvidedByUsedInOperatingActivities"][frame] = round(rev * rng.uniform(0.0, 0.3))
+            self.facts[cik] = series
+        self.by_cik = {c["cik"]: c for c in self.companies}
+
+    def company_tickers(self) -> Dict:
+        return {str(i): {"cik_str": int(c["cik"]), "ticker": c["ticker"], "title": c["name"]}
+                for i, c in enumerate(self.companies)}
+
+    def concept(self, cik: str, tag: str) -> Optional[Dict]:
+        vals = self.facts.get(cik, {}).get(tag)
+        if not vals:
+            return None
+        usd = []
+        for frame, val in vals.items():
+            year, q = int(frame[2:6]), int(frame[-1])
+            usd.append({"end": _quarter_end(year, q).isoformat(), "val": val, "fy": year,
+                        "fp": f"Q{q}" if q < 4 else "FY", "form": "10-Q" if q < 4 else "10-K", "frame": frame})
+        return {"cik": int(cik), "taxonomy": "us-gaap", "tag": tag,
+                "entityName": self.by_cik[cik]["name"], "units": {"USD": usd}}
+
+    def frame(self, tag: str, period: str) -> Optional[Dict]:
+        data = [{"cik": int(cik), "entityName": self.by_cik[cik]["name"], "loc": "US-CA",
+                 "end": _quarter_end(int(period[2:6]), int(period[-1])).isoformat(), "val": tags[tag][period]}
+                for cik, tags in self.facts.items() if period in tags.get(tag, {})]
+        if not data:
+            return None
+        return {"taxonomy": "us-gaap", "tag": tag, "uom": "USD", "ccp": period, "pts": len(data), "data": data}
+
+    def submissions(self, cik: str) -> Optional[Dict]:
+        c = self.by_cik.get(cik)
+        if not c:
+            return None
+        return {"cik": cik, "name": c["name"], "sic": c["sic"][0], "sicDescription": c["sic"][1]}
+
+_ROUTES = [
+    (re.compile(r"^/files/company_tickers\.json$"), lambda d, m: d.company_tickers()),
+    (re.compile(r"^/api/xbrl/companyconcept/CIK(\d{10})/us-gaap/(\w+)\.json$"), lambda d, m: d.concept(m[1], m[2])),
+    (re.compile(r"^/api/xbrl/frames/us-gaap/(\w+)/USD/(CY\d{4}Q[1-4])\.json$"), lambda d, m: d.frame(m[1], m[2])),
+    (re.compile(r"^/submissions/CIK(\d{10})\.json$"), lambda d, m: d.submissions(m[1])),
+]
+
+def make_handler(data: StubData, latency: float = 0.0, jitter: float = 0.0):
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if latency or jitter:
+                time.sleep(latency + random.uniform(0, jitter))
+            path = self.path.split("?", 1)[0]
+            body = None
+            for pattern, route in _ROUTES:
+                m = pattern.match(path)
+                if m:
+                    body = route(data, m)
+                    break
+            if body is None:
+                self.send_error(404)
+                return
+            raw = json.dumps(body).encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(raw)))
+            self.end_headers()
+            self.wfile.write(raw)
+
+        def log_message(self, *args):
+            pass
+    return Handler
+
+def make_server(host: str = "127.0.0.1", port: int = 0, n_companies: int = 200,
+                latency: float = 0.0, jitter: float = 0.0) -> ThreadingHTTPServer:
+    """latency/jitter: seconds added to every response (fixed + uniform random)."""
+    server = ThreadingHTTPServer((host, port), make_handler(StubData(n_companies), latency, jitter))
+    server.daemon_threads = True
+    return server
+
+def serve_in_thread(**kwargs) -> ThreadingHTTPServer:
+    """Start a stub server on a background thread; base URL is f'http://{host}:{server.server_port}'."""
+    server = make_server(**kwargs)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description="Local stub EDGAR server")
+    ap.add_argument("--host", default="127.0.0.1")
+    ap.add_argument("--port", type=int, default=8765)
+    ap.add_argument("--companies", type=int, default=200)
+    ap.add_argument("--latency", type=float, default=0.0, help="Seconds added to every response")
+    ap.add_argument("--jitter", type=float, default=0.0, help="Extra uniform random delay, up to this many seconds")
+    args = ap.parse_args()
+    srv = make_server(args.host, args.port, args.companies, args.latency, args.jitter)
+    print(f"Stub EDGAR on http://{args.host}:{srv.server_port}", flush=True)
+    srv.serve_forever()
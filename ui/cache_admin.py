@@ -0,0 +1,39 @@
+# ui/cache_admin.py
+#Sidebar panel for inspecting and invalidating the shared in-process cache.
+import pandas as pd
+import streamlit as st
+from utils.sized_cache import SizeAwareCache
+
+def render_cache_admin(cache: SizeAwareCache):
+    with st.sidebar.expander("🗄️ Cache admin", expanded=False):
+        s = cache.stats()
+        st.metric("Memory", f"{s['bytes'] / 2**20:,.1f} / {s['max_bytes'] / 2**20:,.0f} MB")
+        c1, c2 = st.columns(2)
+        c1.metric("Entries", f"{s['entries']:,}")
+        c2.metric("Hit rate", f"{s['hit_rate']:.0%}")
+        st.caption(f"{s['policy'].upper()} · hits {s['hits']:,} · misses {s['misses']:,} · "
+                   f"evictions {s['evictions']:,} · expired {s['expirations']:,} · too large {s['rejections']:,}")
+
+        entries = pd.DataFrame(cache.entries())
+        if entries.empty:
+            return
+        entries["cik"] = entries["tags"].apply(
+            lambda tags: next((t.split(":", 1)[1] for t in tags if t.startswith("cik:")), ""))
+        per_cik = (entries[entries["cik"] != ""].groupby("cik")
+                   .agg(entries=("key", "size"), kb=("bytes", lambda b: round(b.sum() / 1024, 1)), hits=("hits", "sum"))
+                   .sort_values("kb", ascending=False))
+        st.dataframe(per_cik, use_container_width=True)
+
+        cik = st.selectbox("CIK", options=[""] + per_cik.index.tolist(), key="cache_admin_cik")
+        b1, b2 = st.columns(2)
+        with b1:
+            if st.button("Invalidate CIK", disabled=not cik, key="cache_admin_invalidate"):
+                n = cache.invalidate_tag(f"cik:{cik}")
+                st.success(f"Dropped {n} entries for {cik}.")
+        with b2:
+            if st.button("Clear all", key="cache_admin_clear"):
+                cache.clear()
+                st.success("Cache cleared.")
+
+        by_kind = entries.groupby("kind").agg(entries=("key", "size"), kb=("bytes", lambda b: round(b.sum() / 1024, 1)))
+        st.dataframe(by_kind, use_container_width=True)
@@ -1,83 +1,15 @@
 # ui/exports.py
 import io
-from typing import Optional, List
+from typing import Optional
 from datetime import datetime
 import pandas as pd
 import streamlit as st
 from xlsxwriter.utility import xl_rowcol_to_cell
 from utils.components import copy_button
+from services.columnar import ARROW_MIME, PARQUET_MIME, arrow_available
+from services.formatting import to_csv_block, to_plaintext_combined
 from urllib.parse import quote
 
-# ----------------- helpers: formatting & CSV assembly -----------------
-
-def _clean_df_for_text(df: pd.DataFrame) -> pd.DataFrame:
-    if df is None or df.empty:
-        return pd.DataFrame(columns=["(empty)"])
-    out = df.copy()
-    # stringify and remove 'nan'
-    for c in out.columns:
-        out[c] = out[c].apply(lambda v: "" if pd.isna(v) or str(v).lower() == "nan" else str(v))
-    return out
-
-def _is_numeric_cell(s: str) -> bool:
-    if not s or s.strip() == "": return False
-    # accept plain numbers or currency/percent-looking values
-    t = s.replace(",", "").replace("$", "").replace("€", "").replace("%", "")
-    try:
-        float(t)
-        return True
-    except ValueError:
-        return False
-
-def _render_ascii_table(df: pd.DataFrame) -> str:
-    """Pretty monospace ASCII with right-aligned numeric columns."""
-    df2 = _clean_df_for_text(df)
-    cols = list(df2.columns)
-
-    # decide alignment per column
-    right_align = []
-    for c in cols:
-        sample_vals = df2[c].dropna().astype(str).head(20).tolist()
-        right_align.append(any(_is_numeric_cell(v) for v in sample_vals))
-
-    # width calc
-    widths = []
-    for i, c in enumerate(cols):
-        data_lens = [len(v) for v in df2[c].astype(str).tolist()]
-        widths.append(max(len(str(c)), *(data_lens or [0])))
-
-    def fmt_cell(txt, i):
-        txt = str(txt)
-        return txt.rjust(widths[i]) if right_align[i] else txt.ljust(widths[i])
-
-    header = " | ".join(fmt_cell(c, i) for i, c in enumerate(cols))
-    sep    = "-+-".join("-" * w for w in widths)
-    body   = "\n".join(" | ".join(fmt_cell(df2.iloc[r, i], i) for i in range(len(cols)))
-                       for r in range(len(df2)))
-
-    return f"{header}\n{sep}\n{body if body else ''}"
-
-def to_plaintext_combined(
-    summary_df: pd.DataFrame,
-    segments_df: Optional[pd.DataFrame],
-    title: str,
-    notes_text: str = ""
-) -> str:
-    ts = datetime.now().strftime("%Y-%m-%d %H:%M")
-    parts: List[str] = [f"{title}\nGenerated: {ts}\n"]
-    parts.append("Financial Summary")
-    parts.append(_render_ascii_table(summary_df))
-    if notes_text.strip():
-        parts.append("\nNotes\n" + notes_text.strip())
-    if segments_df is not None and not segments_df.empty:
-        parts.append("\nMarkets / Sectors (Manual)")
-        parts.append(_render_ascii_table(segments_df))
-    return "\n".join(parts).strip() + "\n"
-
-def _to_csv_block(df: pd.DataFrame) -> str:
-    """Return CSV block (header+rows) for a DF."""
-    return df.to_csv(index=False, lineterminator="\n")
-
 # ----------------- main: one-click buttons (same-sheet CSV/Excel) -----------------
 
 def render_downloads_combined(
@@ -98,12 +30,12 @@ def render_downloads_combined(
 
     # ------- CSV (single file with both tables stacked) -------
     csv_blocks = [f"# {title}", f"# Generated: {ts}", ""]
-    csv_blocks += ["# Financial Summary", _to_csv_block(editable_summary_df).rstrip()]
+    csv_blocks += ["# Financial Summary", to_csv_block(editable_summary_df).rstrip()]
     if include_notes and notes_text.strip():
         # Put notes as a small 1-col CSV block
         csv_blocks += ["", "# Notes", '"{}"'.format(notes_text.replace('"', '""').replace("\n", "\\n"))]
     if segments_df is not None and not segments_df.empty:
-        csv_blocks += ["", "# Markets / Sectors (Manual)", _to_csv_block(segments_df).rstrip()]
+        csv_blocks += ["", "# Markets / Sectors (Manual)", to_csv_block(segments_df).rstrip()]
     csv_bytes = ("\n".join(csv_blocks) + "\n").encode("utf-8")
 
     # ------- Excel (single worksheet) -------
@@ -185,3 +117,28 @@ def render_downloads_combined(
         )
     with c4:
         copy_button("Copy plaintext", quote(plaintext))
+
+
+# ----------------- typed columnar downloads (Parquet / Arrow IPC) -----------------
+
+def render_columnar_downloads(exports: Optional[dict], title: str):
+    """
+    Buttons for pre-built typed exports: {'parquet': bytes, 'arrow': bytes, 'rows': int}.
+    Built from the raw table (no '$1,234' strings), so pandas/polars load real dtypes.
+    """
+    if not arrow_available():
+        st.caption("Install pyarrow to enable Parquet / Arrow downloads.")
+        return
+    if not exports or not exports.get("rows"):
+        st.info("No history to export.")
+        return
+    safe_title = title.replace(" ", "_")
+    st.caption(f"{exports['rows']:,} quarterly rows · Parquet {len(exports['parquet']) / 1024:,.0f} KB · "
+               f"Arrow {len(exports['arrow']) / 1024:,.0f} KB")
+    c1, c2 = st.columns(2)
+    with c1:
+        st.download_button("⬇️ Download Parquet", data=exports["parquet"],
+                           file_name=f"{safe_title}.parquet", mime=PARQUET_MIME, key="dl_history_parquet")
+    with c2:
+        st.download_button("⬇️ Download Arrow IPC", data=exports["arrow"],
+                           file_name=f"{safe_title}.arrow", mime=ARROW_MIME, key="dl_history_arrow")
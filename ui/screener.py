@@ -0,0 +1,90 @@
+# ui/screener.py
+#This file renders the cross-sectional screener (one period, every filer) built on the XBRL frames API.
+from datetime import date
+import pandas as pd
+import streamlit as st
+from config import SCREEN_METRICS, SCREEN_MAX_SIC_LOOKUPS, SCREEN_BUDGET_S
+from services.screening import build_screen, filter_by_sic, rank_table, peer_rank, shift_period
+from utils.cache import cached_table
+from utils.components import staleness_notice
+
+def _recent_periods(n: int = 12) -> list[str]:
+    # Frames for a quarter fill in as 10-Qs land, so start from the last fully-reported quarter
+    today = date.today()
+    current = f"CY{today.year}Q{(today.month - 1) // 3 + 1}"
+    return [shift_period(current, -lag) for lag in range(2, n + 2)]
+
+@cached_table("screen", ttl=3600)
+def _screen(period: str, metric: str, sic_prefix: str, max_lookups: int, _fetcher) -> tuple:
+    """(screen, rows whose SIC was not checked, SIC lookups that ran out of budget)."""
+    df = build_screen(_fetcher, period, metric)
+    if sic_prefix and not df.empty:
+        return filter_by_sic(df, _fetcher, sic_prefix, max_lookups)
+    return df, 0, 0
+
+def _fmt(df: pd.DataFrame, metric: str) -> pd.DataFrame:
+    view = df.copy()
+    if metric in view.columns:
+        view[metric] = view[metric].apply(lambda v: "" if pd.isna(v) else f"${v:,.0f}")
+    for c in view.columns:
+        if c.endswith("Growth") or c == "Gross Margin":
+            view[c] = view[c].apply(lambda v: "" if pd.isna(v) else f"{v:.1%}")
+        elif c.endswith("Pctl"):
+            view[c] = view[c].apply(lambda v: "" if pd.isna(v) else f"{v*100:.0f}")
+    return view
+
+def render_screener(fetcher):
+    st.subheader("🔎 Cross-Sectional Screener (XBRL Frames)")
+    c1, c2, c3, c4 = st.columns(4)
+    with c1:
+        period = st.selectbox("Period", options=_recent_periods(), key="screen_period")
+    with c2:
+        metric = st.selectbox("Metric", options=list(SCREEN_METRICS), key="screen_metric")
+    with c3:
+        sic_prefix = st.text_input(
+            "SIC code prefix (optional)", key="screen_sic",
+            help=f"e.g. 367 for semiconductors. SIC needs one lookup per company, starting from the largest by {metric}."
+        ).strip()
+    with c4:
+        max_lookups = int(st.number_input("SIC lookups", min_value=10, max_value=10_000, step=50,
+                                          value=SCREEN_MAX_SIC_LOOKUPS, key="screen_sic_lookups",
+                                          disabled=not sic_prefix))
+
+    with st.spinner(f"Loading {metric} for all filers, {period}..."), fetcher.page_budget(SCREEN_BUDGET_S) as page:
+        screen, unchecked, unresolved = _screen(period, metric, sic_prefix, max_lookups, fetcher)
+    if page.degraded:
+        _screen.invalidate(period, metric, sic_prefix, max_lookups)
+        staleness_notice(page)
+    if screen.empty:
+        st.warning(f"No frame data available for {metric} in {period}.")
+        return
+    if unchecked:
+        st.warning(f"SIC was checked for the top {max_lookups:,} filers by {metric} only; "
+                   f"{unchecked:,} smaller filers were not checked and are missing from this sector screen. "
+                   "Raise 'SIC lookups' to include them.")
+    if unresolved:
+        st.warning(f"SIC could not be fetched for {unresolved:,} filers in time; they are missing from "
+                   "this sector screen. Reload the page to retry them.")
+
+    s1, s2, s3 = st.columns(3)
+    with s1:
+        sort_options = [metric, "YoY Growth", "QoQ Growth", "Gross Margin"]
+        sort_by = st.selectbox("Rank by", options=sort_options, key="screen_sort")
+    with s2:
+        ascending = st.checkbox("Ascending", value=False, key="screen_ascending")
+    with s3:
+        top_n = st.number_input("Rows", min_value=10, max_value=1000, value=50, step=10, key="screen_top_n")
+
+    ranked = rank_table(screen, sort_by, ascending)
+    st.caption(f"{len(ranked):,} companies with {sort_by} in {period}")
+    st.dataframe(_fmt(ranked.head(int(top_n)), metric), use_container_width=True, hide_index=True)
+
+    names = [""] + sorted(screen["Company"].unique().tolist())
+    peer = st.selectbox("Peer rank for company", options=names, key="screen_peer")
+    if peer:
+        cik = screen.loc[screen["Company"] == peer, "CIK"].iloc[0]
+        cols = st.columns(len(sort_options))
+        for col, name in zip(cols, sort_options):
+            res = peer_rank(screen, cik, name)
+            with col:
+                st.metric(name, f"#{res[0]} of {res[1]}" if res else "—")
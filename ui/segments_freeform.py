@@ -13,18 +13,51 @@ DEFAULT_COLUMNS = [
     "Notes",
 ]
 
+# Filings report USD, so a prefilled table swaps the € revenue column for a $ one
+PREFILL_CURRENCY_COLUMNS = {"Revenue (€M)": "Revenue ($M)"}
+
+def _rows_from_prefill(prefill: pd.DataFrame, columns: list[str]) -> pd.DataFrame:
+    def pct(v):
+        return "" if pd.isna(v) else f"{v:.1%}"
+    columns = [PREFILL_CURRENCY_COLUMNS.get(c, c) for c in columns]
+    rows = pd.DataFrame({c: [""] * len(prefill) for c in columns})
+    filled = {
+        "Segment (% of Revenue)": [f"{s} ({pct(sh)})" for s, sh in zip(prefill["Segment"], prefill["Share"])],
+        "Revenue ($M)": [f"{v / 1e6:,.1f}" for v in prefill["Revenue"]],
+        "QoQ Change": [pct(v) for v in prefill["QoQ Change"]],
+        "YoY Change": [pct(v) for v in prefill["YoY Change"]],
+    }
+    for c, vals in filled.items():
+        if c in columns:
+            rows[c] = vals
+    return rows
+
 def render_freeform_segments(
     columns: list[str] = DEFAULT_COLUMNS,
     default_rows: list[str] = DEFAULT_MARKETS,   # ← new
     state_key: str = "segments_freeform_df",
-    title: str = "🗂️ Segments (Manual Freeform)"
+    title: str = "🗂️ Segments (Manual Freeform)",
+    prefill: pd.DataFrame | None = None,
+    prefill_key: str | None = None,
 ) -> pd.DataFrame:
     """
     Renders an editable table. Prefills the 'Segment (% of Revenue)' column
     with typical industry segments, but everything is editable and rows are dynamic.
+    If `prefill` (from services.fsds.lookup_segments) has rows, they replace the
+    defaults whenever `prefill_key` (e.g. cik + quarter) changes.
     """
     st.subheader(title)
 
+    has_prefill = prefill is not None and not prefill.empty
+    seed_key = f"{state_key}_prefill_key"
+    if has_prefill and st.session_state.get(seed_key) != prefill_key:
+        st.session_state[state_key] = _rows_from_prefill(prefill, columns)
+        st.session_state[seed_key] = prefill_key
+    elif not has_prefill and st.session_state.get(seed_key) is not None:
+        # Previous company/quarter was prefilled; don't carry its figures over
+        st.session_state.pop(state_key, None)
+        st.session_state[seed_key] = None
+
     # Initialize once: prefill first column; other columns empty
     if state_key not in st.session_state:
         init = pd.DataFrame(columns=columns)
@@ -32,6 +65,12 @@ def render_freeform_segments(
             init["Segment (% of Revenue)"] = default_rows
         st.session_state[state_key] = init
 
+    if has_prefill and st.session_state.get(seed_key) == prefill_key:
+        st.caption("Prefilled from the SEC Financial Statement Data Sets (reported USD); edit freely.")
+
+    # Columns in use: a USD prefill renames the revenue column
+    columns = list(st.session_state[state_key].columns)
+
     # Optional quick actions
     a1, a2 = st.columns(2)
     with a1:
@@ -1,24 +1,6 @@
 # ui/summary_table.py
-import pandas as pd
 import streamlit as st
 
-def format_for_display(current, qoq, yoy) -> pd.DataFrame:
-    combined = pd.DataFrame({"Current": current, "QoQ Change": qoq, "YoY Change": yoy})
-    def _fmt(row):
-        out = {}
-        for col, val in row.items():
-            if isinstance(val, float):
-                if "Margin" in row.name:
-                    out[col] = f"{val:.1%}"
-                elif "Change" in col:
-                    out[col] = f"{val:.1%}"
-                else:
-                    out[col] = f"${val:,.0f}"
-            else:
-                out[col] = val
-        return pd.Series(out)
-    return combined.apply(_fmt, axis=1)
-
 def editable_table(df_formatted, title: str):
     st.subheader(title)
     init = df_formatted.copy()
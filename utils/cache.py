@@ -1,5 +1,9 @@
 # utils/cache.py
+import functools
+import pandas as pd
 import streamlit as st
+from config import CACHE_MAX_BYTES, CACHE_POLICY
+from utils.sized_cache import SizeAwareCache
 
 @st.cache_resource
 def get_resource(_factory):
@@ -7,3 +11,35 @@ def get_resource(_factory):
 
 def cached_data(ttl=3600):
     return st.cache_data(ttl=ttl)
+
+@st.cache_resource
+def shared_cache() -> SizeAwareCache:
+    """One memory-bounded cache per server process, shared by every session and the fetcher."""
+    return SizeAwareCache(CACHE_MAX_BYTES, CACHE_POLICY)
+
+def cached_table(kind: str, ttl=3600, tags=None):
+    """
+    Like cached_data, but stored in shared_cache() under (kind, *args) so entries count
+    against the memory budget and can be invalidated per CIK. Arguments starting with '_'
+    are left out of the key, as with st.cache_data. `tags(*args, **kwargs)` returns tag strings.
+    DataFrames are copied on the way out, since callers add columns to them.
+    """
+    def decorator(fn):
+        names = fn.__code__.co_varnames[:fn.__code__.co_argcount]
+
+        def make_key(args, kwargs):
+            key_args = [a for n, a in zip(names, args) if not n.startswith("_")]
+            key_kwargs = sorted((k, v) for k, v in kwargs.items() if not k.startswith("_"))
+            return (kind, *key_args, *key_kwargs)
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            value = shared_cache().get_or_compute(
+                make_key(args, kwargs), lambda: fn(*args, **kwargs), ttl=ttl,
+                tags=tags(*args, **kwargs) if tags else ())
+            return value.copy() if isinstance(value, pd.DataFrame) else value
+
+        # e.g. load.invalidate(cik, tag, name) after a page load served stale data
+        wrapper.invalidate = lambda *args, **kwargs: shared_cache().invalidate(make_key(args, kwargs))
+        return wrapper
+    return decorator
@@ -1,4 +1,6 @@
 # utils/components.py
+from datetime import datetime
+import streamlit as st
 from streamlit.components.v1 import html as html_component
 
 def copy_button(label: str, text: str):
@@ -8,3 +10,14 @@ def copy_button(label: str, text: str):
     </button>
     """
     html_component(code, height=40)
+
+
+def staleness_notice(page):
+    """Visible marker when a page load ran out of budget (page is a services.sec_api.PageLoad)."""
+    parts = []
+    if page.oldest is not None:
+        ts = datetime.fromtimestamp(page.oldest).strftime("%Y-%m-%d %H:%M")
+        parts.append(f"showing cached data from as early as {ts}")
+    if page.missing:
+        parts.append(f"{page.missing} request(s) had no cached copy and were skipped")
+    st.warning(f"⏱️ EDGAR was slow to respond: {'; '.join(parts)}. Rerun to refresh.")
@@ -0,0 +1,147 @@
+# utils/sized_cache.py
+#A thread-safe, memory-bounded cache with per-entry byte accounting, TTLs, tags and statistics.
+#Kept free of Streamlit so services (and the API process) can share it.
+import sys
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Iterable, List, Optional
+
+import pandas as pd
+
+_MISSING = object()
+
+def estimate_size(obj: Any, _seen: Optional[set] = None) -> int:
+    """Approximate resident bytes of obj (deep for DataFrames, dicts, lists and tuples)."""
+    if isinstance(obj, (pd.DataFrame, pd.Series)):
+        usage = obj.memory_usage(deep=True, index=True)
+        return int(usage.sum() if isinstance(obj, pd.DataFrame) else usage)
+    if isinstance(obj, (bytes, bytearray, memoryview)):
+        return sys.getsizeof(obj)
+    _seen = _seen if _seen is not None else set()
+    if id(obj) in _seen:
+        return 0
+    _seen.add(id(obj))
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(estimate_size(k, _seen) + estimate_size(v, _seen) for k, v in obj.items())
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        size += sum(estimate_size(v, _seen) for v in obj)
+    return size
+
+class _Entry:
+    __slots__ = ("value", "nbytes", "expires", "tags", "hits", "created", "last_access")
+
+    def __init__(self, value, nbytes: int, expires: Optional[float], tags: frozenset):
+        self.value, self.nbytes, self.expires, self.tags = value, nbytes, expires, tags
+        self.hits = 0
+        self.created = self.last_access = time.monotonic()
+
+class SizeAwareCache:
+    """
+    Keys are tuples whose first element names the kind of entry, e.g. ('concept', cik, tag).
+    Tags (e.g. 'cik:0000320193') group entries for invalidation.
+    Evicts by least-recently ('lru') or least-frequently ('lfu') used once max_bytes is exceeded.
+    """
+
+    def __init__(self, max_bytes: int, policy: str = "lru"):
+        if policy not in ("lru", "lfu"):
+            raise ValueError(f"Unknown cache policy {policy!r}; use 'lru' or 'lfu'.")
+        self.max_bytes = max_bytes
+        self.policy = policy
+        self._entries: "OrderedDict[Hashable, _Entry]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.RLock()
+        self.hits = self.misses = self.evictions = self.expirations = self.rejections = 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.expires is not None and entry.expires <= time.monotonic():
+                self._drop(key)
+                self.expirations += 1
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return default
+            self.hits += 1
+            entry.hits += 1
+            entry.last_access = time.monotonic()
+            self._entries.move_to_end(key)
+            return entry.value
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None,
+            tags: Iterable[str] = (), nbytes: Optional[int] = None) -> bool:
+        """Store value; returns False if it alone exceeds the budget (it is then not cached)."""
+        nbytes = estimate_size(value) if nbytes is None else nbytes
+        with self._lock:
+            if key in self._entries:
+                self._drop(key)
+            if nbytes > self.max_bytes:
+                self.rejections += 1
+                return False
+            expires = time.monotonic() + ttl if ttl else None
+            self._entries[key] = _Entry(value, nbytes, expires, frozenset(tags))
+            self._bytes += nbytes
+            self._evict(protect=key)
+            return True
+
+    def get_or_compute(self, key: Hashable, compute: Callable[[], Any], ttl: Optional[float] = None,
+                       tags: Iterable[str] = ()) -> Any:
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            value = compute()  # outside the lock: fetches can be slow
+            self.set(key, value, ttl=ttl, tags=tags)
+        return value
+
+    def invalidate(self, key: Hashable) -> bool:
+        with self._lock:
+            if key not in self._entries:
+                return False
+            self._drop(key)
+            return True
+
+    def invalidate_tag(self, tag: str) -> int:
+        with self._lock:
+            keys = [k for k, e in self._entries.items() if tag in e.tags]
+            for k in keys:
+                self._drop(k)
+            return len(keys)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries), "bytes": self._bytes, "max_bytes": self.max_bytes,
+                "policy": self.policy, "hits": self.hits, "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions, "expirations": self.expirations, "rejections": self.rejections,
+            }
+
+    def entries(self) -> List[Dict[str, Any]]:
+        now = time.monotonic()
+        with self._lock:
+            return [{
+                "kind": k[0] if isinstance(k, tuple) else str(k), "key": repr(k), "tags": sorted(e.tags),
+                "bytes": e.nbytes, "hits": e.hits, "age_s": now - e.created,
+                "ttl_left_s": None if e.expires is None else max(0.0, e.expires - now),
+            } for k, e in self._entries.items()]
+
+    def _drop(self, key: Hashable):
+        self._bytes -= self._entries.pop(key).nbytes
+
+    def _evict(self, protect: Hashable):
+        # The entry just stored is never the victim: under LFU it has 0 hits and would always lose
+        while self._bytes > self.max_bytes and len(self._entries) > 1:
+            candidates = (k for k in self._entries if k != protect)
+            if self.policy == "lru":
+                key = next(candidates)
+            else:
+                key = min(candidates, key=lambda k: (self._entries[k].hits, self._entries[k].last_access))
+            self._drop(key)
+            self.evictions += 1